@@ -0,0 +1,161 @@
+"""
+Benchmark de tiempo y pico de memoria de las funciones de analisis
+sobre series sinteticas, de 20 años de dias habiles a millones de
+registros. Compara contra los baselines guardados y falla (exit 1)
+si alguna funcion empeora mas que la tolerancia
+
+Ejecutar desde la raiz del repo
+>>> python -m benchmarks.analytics --save              # guarda baselines
+>>> python -m benchmarks.analytics                     # compara
+Sin baselines (o sin baseline para algun caso) falla salvo con --save
+>>> python -m benchmarks.analytics --rows 5220 1000000 --only b regression
+"""
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+
+from functools import partial
+from pathlib import Path
+from typing import Any, Callable
+
+from src.consignas import a, b, c, d, last_year
+from src.dataclass import Data, to_dataframe
+from src.event_dolar import dolars_month_gen, politic_gen
+from src.periods import stats
+from src.regression import _MODELS, regression
+from src.synthetic import dataset, prices
+
+
+BASELINES: Path = Path(__file__).with_name("baselines.json")
+
+
+def _columnar(rows: int) -> dict:
+    dates, values = prices(rows, years=20)
+    return {"d": dates, "v": values}
+
+
+def _regression(data: Data) -> Callable[[], Any]:
+    # Sin el cache de modelos, se mide el ajuste
+    def run() -> str:
+        _MODELS.clear()
+        return regression(data.usd, (3, 6, 12), verbose=True)
+
+    return run
+
+
+# caso: arma (sin medir) la funcion a medir a partir de la data
+CASES: dict[str, Callable[[Data, int], Callable[[], Any]]] = {
+    "to_dataframe": lambda data, rows: partial(
+        to_dataframe, _columnar(rows), point="usd"
+    ),
+    "last_year": lambda data, rows: partial(last_year, data.usd),
+    "a": lambda data, rows: partial(a, data.var_usd_vs_usd_of),
+    "b": lambda data, rows: partial(b, data.usd, "v"),
+    "c": lambda data, rows: partial(c, data.var_usd_vs_usd_of),
+    "d": lambda data, rows: partial(d, data.var_usd_vs_usd_of),
+    # Data nuevo en cada llamada para no medir el panel memorizado
+    "dolars_month_gen": lambda data, rows: lambda: dolars_month_gen(
+        Data(data)
+    ),
+    "politic_gen": lambda data, rows: partial(politic_gen, data),
+    "periods": lambda data, rows: partial(
+        stats, data.usd, data.usd_of, data.milestones
+    ),
+    "regression": lambda data, rows: _regression(data),
+}
+
+
+def measure(func: Callable[[], Any], repeat: int) -> tuple[float, float]:
+    """
+    Retorna (mejor tiempo en segundos, pico de memoria en MiB).
+    La memoria se mide en una corrida aparte, tracemalloc
+    agrega overhead al tiempo
+    """
+    func()  # calentamiento
+    best: float = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[5220, 100_000, 1_000_000]
+    )
+    parser.add_argument("--only", nargs="+", choices=list(CASES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.25,
+        help="Empeoramiento relativo tolerado en tiempo y memoria",
+    )
+    parser.add_argument("--baselines", type=Path, default=BASELINES)
+    parser.add_argument(
+        "--save", action="store_true", help="Guarda los resultados"
+    )
+    args = parser.parse_args()
+
+    if not args.save and not args.baselines.exists():
+        parser.error(
+            f"No existe {args.baselines}, generarlo primero con --save"
+        )
+    baselines: dict = (
+        json.loads(args.baselines.read_text())
+        if args.baselines.exists()
+        else {}
+    )
+    results: dict[str, dict[str, float]] = {}
+    failed: list[str] = []
+
+    print("%-18s %10s %10s %10s %10s %10s  %s" % (
+        "case", "rows", "ms", "base ms", "MiB", "base MiB", ""
+    ))
+    for rows in args.rows:
+        data: Data = dataset(rows)
+
+        for name in args.only or CASES:
+            key: str = f"{name}@{rows}"
+            seconds, mib = measure(CASES[name](data, rows), args.repeat)
+            results[key] = {"seconds": seconds, "mib": mib}
+
+            # Holgura absoluta (1 ms, 0.1 MiB) para los casos chicos.
+            # Un caso sin baseline no se puede comparar y tambien falla
+            base: dict = baselines.get(key, {})
+            worse: bool = bool(base) and (
+                seconds > base["seconds"] * (1 + args.tolerance) + 1e-3
+                or mib > base["mib"] * (1 + args.tolerance) + 0.1
+            )
+            if worse or not base:
+                failed.append(key)
+
+            print("%-18s %10i %10.2f %10s %10.2f %10s  %s" % (
+                name, rows, seconds * 1000,
+                "%.2f" % (base["seconds"] * 1000) if base else "-",
+                mib,
+                "%.2f" % base["mib"] if base else "-",
+                "REGRESION" if worse else "" if base else "SIN BASELINE",
+            ))
+
+    if args.save:
+        args.baselines.write_text(
+            json.dumps({**baselines, **results}, indent=2, sort_keys=True)
+        )
+        print(f"\nBaselines guardados en {args.baselines}")
+    elif failed:
+        print("\nEmpeoraron o sin baseline: " + ", ".join(failed))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
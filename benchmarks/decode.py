@@ -0,0 +1,74 @@
+"""
+Benchmark: response.json() + DataFrame vs SeriesDecoder
+
+Ejecutar desde la raiz del repo
+>>> python -m benchmarks.decode --rows 6000 600000
+"""
+import argparse
+import json
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.dataclass import to_dataframe
+from src.decode import decode
+
+
+def payload(rows: int) -> bytes:
+    """
+    Body con la forma del API: [{"d": "YYYY-MM-DD", "v": float}, ...]
+    """
+    # Las fechas se repiten cada ~100 años para no salir del rango de ns
+    days = np.arange(rows) % 36500
+    dates = (np.datetime64("2000-05-24") + days).astype(str)
+    values = np.exp(np.cumsum(np.random.default_rng(0).normal(0, 0.01, rows)))
+    return json.dumps(
+        [{"d": d, "v": round(float(v), 4)} for d, v in zip(dates, values)]
+    ).encode()
+
+
+def json_path(body: bytes) -> pd.DataFrame:
+    # Camino anterior: lista de dicts y conversion de fechas fila por fila
+    df = pd.DataFrame(json.loads(body)).rename(columns={"d": "date"})
+    df["date"] = pd.to_datetime(df["date"]).dt.date.astype(np.datetime64)
+    return df
+
+
+def columnar_path(body: bytes) -> pd.DataFrame:
+    return to_dataframe(decode(body))
+
+
+def measure(func, body: bytes) -> tuple[float, float]:
+    """
+    Retorna (segundos, pico de memoria en MiB)
+    """
+    tracemalloc.start()
+    start = time.perf_counter()
+    func(body)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak / 2**20
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[6000, 600000])
+    args = parser.parse_args()
+
+    print("%10s %12s %12s %12s %12s" % (
+        "rows", "json s", "json MiB", "column s", "column MiB"
+    ))
+    for rows in args.rows:
+        body = payload(rows)
+        json_s, json_mb = measure(json_path, body)
+        col_s, col_mb = measure(columnar_path, body)
+        print("%10i %12.4f %12.2f %12.4f %12.2f" % (
+            rows, json_s, json_mb, col_s, col_mb
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,85 @@
+"""
+Benchmark end to end de Data.call_api contra el servidor local
+de prueba: throughput y percentiles de latencia
+
+Ejecutar desde la raiz del repo
+>>> python -m benchmarks.fetch --rows 6000 60000 --latency 0 0.05
+>>> python -m benchmarks.fetch --error-rate 0.1 --calls 50
+"""
+import argparse
+import itertools
+import time
+
+import numpy as np
+
+from src.api import API, TransportConfig
+from src.dataclass import Data
+from src.fixture import FixtureServer
+
+
+POINTS: tuple[str, ...] = (
+    "usd",
+    "usd_of",
+    "var_usd_vs_usd_of",
+    "inflacion_mensual_oficial",
+    "var_usd_anual",
+    "var_usd_of_anual",
+    "milestones",
+)
+
+
+def measure(
+    server: FixtureServer, calls: int, points: tuple[str, ...]
+) -> tuple[np.ndarray, int]:
+    """
+    Corre calls veces Data.call_api sin cache, retorna
+    (segundos de cada llamada, registros recibidos por llamada)
+    """
+    elapsed: list[float] = []
+    rows: int = 0
+
+    with server.running() as site:
+        API.use(site)
+        Data().call_api(*points)  # calentamiento, arma los bodies
+
+        for _ in range(calls):
+            data = Data()
+            start = time.perf_counter()
+            data.call_api(*points)
+            elapsed.append(time.perf_counter() - start)
+            rows = sum(len(data[p]) for p in points)
+
+    return np.array(elapsed), rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[6000])
+    parser.add_argument("--latency", type=float, nargs="+", default=[0.0])
+    parser.add_argument("--error-rate", type=float, nargs="+", default=[0.0])
+    parser.add_argument("--calls", type=int, default=20)
+    args = parser.parse_args()
+
+    # Sin esperas entre reintentos, se mide el transporte
+    API(config=TransportConfig(backoff=0.0, retries=8))
+
+    print("%10s %8s %6s %9s %9s %9s %9s %12s" % (
+        "rows", "latency", "error", "calls/s", "p50 ms", "p90 ms",
+        "p99 ms", "rows/s"
+    ))
+    for rows, latency, error_rate in itertools.product(
+        args.rows, args.latency, args.error_rate
+    ):
+        server = FixtureServer(
+            rows=rows, latency=latency, error_rate=error_rate, seed=0
+        )
+        elapsed, received = measure(server, args.calls, POINTS)
+        p50, p90, p99 = np.percentile(elapsed, [50, 90, 99]) * 1000
+        print("%10i %8.3f %6.2f %9.2f %9.1f %9.1f %9.1f %12.0f" % (
+            rows, latency, error_rate, len(elapsed) / elapsed.sum(),
+            p50, p90, p99, received * len(elapsed) / elapsed.sum()
+        ))
+
+
+if __name__ == "__main__":
+    main()
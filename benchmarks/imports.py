@@ -0,0 +1,71 @@
+"""
+Benchmark de tiempo de import en frio, falla si algun modulo
+supera su presupuesto o carga dependencias que no le corresponden
+
+Ejecutar desde la raiz del repo
+>>> python -m benchmarks.imports
+"""
+import argparse
+import subprocess
+import sys
+
+
+# modulo: (segundos, dependencias pesadas que no deberia cargar)
+BUDGETS: dict[str, tuple[float, tuple[str, ...]]] = {
+    "src": (0.05, ("pandas", "numpy", "aiohttp", "matplotlib", "sklearn")),
+    "src.dtypes": (0.05, ("pandas", "numpy", "aiohttp", "matplotlib")),
+    "src.__main__": (0.05, ("pandas", "numpy", "aiohttp", "matplotlib")),
+    "src.dataclass": (1.5, ("aiohttp", "matplotlib", "sklearn")),
+    "src.bcra": (1.5, ("aiohttp", "matplotlib", "sklearn")),
+}
+
+PROBE: str = """
+import sys, time
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start)
+print(",".join(m for m in {heavy!r} if m in sys.modules))
+"""
+
+
+def measure(module: str, heavy: tuple[str, ...]) -> tuple[float, list[str]]:
+    """
+    Importa module en un interprete nuevo, retorna
+    (segundos, dependencias pesadas cargadas)
+    """
+    out = subprocess.run(
+        [sys.executable, "-c", PROBE.format(module=module, heavy=heavy)],
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout.splitlines()
+    return float(out[0]), [m for m in out[1].split(",") if m]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    failed: bool = False
+    print("%-16s %10s %10s  %s" % ("module", "seconds", "budget", "heavy"))
+
+    for module, (budget, heavy) in BUDGETS.items():
+        runs = [measure(module, heavy) for _ in range(args.repeat)]
+        seconds: float = min(s for s, _ in runs)
+        loaded: list[str] = runs[0][1]
+
+        ok: bool = seconds <= budget and not loaded
+        failed |= not ok
+        status: str = "" if ok else "<- FALLA"
+        heavy_loaded: str = ",".join(loaded) or "-"
+        print(
+            "%-16s %10.3f %10.3f  %s %s"
+            % (module, seconds, budget, heavy_loaded, status)
+        )
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""
+Chequeo de consistencia de los streams incrementales contra las
+consignas batch: en varios puntos de la historia, BrechaStream y
+VolatilityStream deben dar lo mismo que a, b, c y d sobre
+Window.last(days, asof=ultima fecha). Falla (exit 1) si difieren
+
+Ejecutar desde la raiz del repo
+>>> python -m benchmarks.streams
+>>> python -m benchmarks.streams --rows 5220 --checks 20 --nan 0.01
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+
+from src.consignas import a, b, c, d
+from src.stream import BrechaStream, VolatilityStream
+from src.synthetic import dataset
+from src.window import Window
+
+
+def compare(
+    brecha: pd.DataFrame, usd: pd.DataFrame, checks: int, days: int
+) -> list[str]:
+    """
+    Ingresa las series a los streams y compara en checks puntos,
+    retorna la lista de diferencias encontradas
+    """
+    errors: list[str] = []
+    stream, volatility = BrechaStream(days), VolatilityStream(days)
+    points: set[int] = set(
+        np.linspace(days, len(brecha) - 1, checks).astype(int).tolist()
+    )
+
+    rows = zip(
+        brecha.date.values, brecha.v.values, usd.date.values, usd.v.values
+    )
+    for i, (date, value, usd_date, price) in enumerate(rows):
+        stream.push(date, float(value))
+        volatility.push(usd_date, float(price))
+        if i not in points:
+            continue
+
+        window = Window.last(days=days, asof=pd.Timestamp(date))
+        seen: pd.DataFrame = brecha.iloc[: i + 1]
+        expected_c = c(seen, window)
+        got_c = stream.max_week()
+        expected_d = d(seen, window)["v"]
+        got_d = stream.weekday_mean()["v"].reindex(expected_d.index)
+        expected_b = b(usd.iloc[: i + 1], "v", window)
+        got_b = volatility.top(len(expected_b))
+
+        if stream.max_day() != a(seen, window):
+            errors.append(f"a@{date}: {stream.max_day()} != {a(seen, window)}")
+        if got_c[:2] != expected_c[:2] or not np.isclose(
+            got_c[2], expected_c[2], rtol=1e-5
+        ):
+            errors.append(f"c@{date}: {got_c} != {expected_c}")
+        if not np.allclose(got_d, expected_d, rtol=1e-5):
+            errors.append(f"d@{date}: {got_d.to_dict()}")
+        if not np.allclose(got_b.volatility, expected_b.volatility):
+            errors.append(f"b@{date}: {got_b.volatility.tolist()}")
+    return errors
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=2000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--checks", type=int, default=10)
+    parser.add_argument(
+        "--nan",
+        type=float,
+        default=0.01,
+        help="Fraccion de valores nulos (null del API) en la brecha",
+    )
+    args = parser.parse_args()
+
+    data = dataset(args.rows)
+    brecha: pd.DataFrame = data.var_usd_vs_usd_of.copy()
+    rng = np.random.default_rng(0)
+    brecha.loc[rng.random(len(brecha)) < args.nan, "v"] = np.nan
+
+    errors: list[str] = compare(brecha, data.usd, args.checks, args.days)
+    for error in errors:
+        print(error)
+    print("%i puntos comparados, %i diferencias" % (args.checks, len(errors)))
+    if errors:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark de QueryPool (data en memoria compartida) contra un
+ProcessPoolExecutor que serializa el DataFrame en cada trabajo
+
+Ejecutar desde la raiz del repo
+>>> python -m benchmarks.workers --rows 5220 1000000 --jobs 64
+"""
+import argparse
+import time
+
+from concurrent.futures import ProcessPoolExecutor
+
+from src.consignas import c
+from src.synthetic import dataset
+from src.window import Window
+from src.workers import QueryPool
+
+
+def windows(jobs: int) -> list[Window]:
+    return [Window.last(days=30 + 10 * i) for i in range(jobs)]
+
+
+def pickled(data, jobs: int, workers: int) -> float:
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [
+            pool.submit(c, data.var_usd_vs_usd_of, window)
+            for window in windows(jobs)
+        ]
+        [f.result() for f in futures]
+    return time.perf_counter() - start
+
+
+def shared(data, jobs: int, workers: int) -> float:
+    start = time.perf_counter()
+    with QueryPool(data, workers=workers) as pool:
+        futures = pool.map(
+            "c", [("var_usd_vs_usd_of", window) for window in windows(jobs)]
+        )
+        [f.result() for f in futures]
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[5220, 1000000])
+    parser.add_argument("--jobs", type=int, default=64)
+    parser.add_argument("--workers", type=int, default=4)
+    args = parser.parse_args()
+
+    print("%10s %6s %12s %12s" % ("rows", "jobs", "pickle ms", "shared ms"))
+    for rows in args.rows:
+        data = dataset(rows, points=("var_usd_vs_usd_of",))
+        print("%10i %6i %12.1f %12.1f" % (
+            rows, args.jobs,
+            pickled(data, args.jobs, args.workers) * 1000,
+            shared(data, args.jobs, args.workers) * 1000,
+        ))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,5 +4,5 @@ from setuptools import setup, find_packages
 setup(
     name="HENRY-PI-1",
     version="1.0",
-    packages=find_packages(),
+    packages=find_packages(exclude=["benchmarks"]),
 )
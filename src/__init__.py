@@ -1,3 +1,11 @@
-from .bcra import main
-
 __all__ = ["main"]
+
+
+def __getattr__(name: str):
+    # main se importa recien cuando se usa: importar src no debe
+    # cargar pandas, aiohttp ni matplotlib
+    if name == "main":
+        from .bcra import main
+
+        return main
+    raise AttributeError(f"module 'src' has no attribute '{name}'")
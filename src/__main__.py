@@ -1,5 +1,146 @@
-from bcra import main
+import argparse
+import sys
+
+
+def cli(argv: list[str] | None = None) -> None:
+    """
+    Entrada de linea de comandos
+
+    >>> python -m src                 # reporte completo
+    >>> python -m src run c d         # solo las consignas c y d
+    >>> python -m src report --format json
+    >>> python -m src serve --port 8080
+    >>> python -m src fixture --port 8081 --latency 0.05
+    >>> python -m src --profile run c d
+    """
+    parser = argparse.ArgumentParser(
+        prog="python -m src", description="Reporte del dolar en Argentina"
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Imprime el desglose de tiempo y memoria por etapa",
+    )
+    parser.add_argument(
+        "--metrics",
+        metavar="FILE",
+        help="Exporta las metricas: .prom (Prometheus) o JSON por linea",
+    )
+    commands = parser.add_subparsers(dest="command")
+
+    report = commands.add_parser(
+        "report", help="Imprime el reporte (por defecto)"
+    )
+
+    run = commands.add_parser(
+        "run", help="Ejecuta solo las tareas pedidas y sus dependencias"
+    )
+    run.add_argument("targets", nargs="+", metavar="TAREA")
+
+    for command in (report, run):
+        command.add_argument(
+            "--format",
+            choices=["console", "json", "markdown"],
+            default="console",
+        )
+        command.add_argument("--site", help="URL alternativa del API")
+
+    serve = commands.add_parser(
+        "serve", help="Calculadora de prediccion como servicio HTTP"
+    )
+    serve.add_argument("--host", default="127.0.0.1")
+    serve.add_argument("--port", type=int, default=8080)
+    serve.add_argument(
+        "--series", nargs="+", default=["usd", "usd_of"], metavar="ENDPOINT"
+    )
+    serve.add_argument(
+        "--refresh",
+        type=float,
+        default=3600.0,
+        help="Segundos entre refrescos de los modelos",
+    )
+    serve.add_argument("--site", help="URL alternativa del API")
+
+    fixture = commands.add_parser(
+        "fixture", help="Servidor local que reemplaza al API"
+    )
+    fixture.add_argument("--host", default="127.0.0.1")
+    fixture.add_argument("--port", type=int, default=8081)
+    fixture.add_argument(
+        "--rows",
+        type=int,
+        default=6000,
+        help="Registros de las respuestas sinteticas",
+    )
+    fixture.add_argument("--latency", type=float, default=0.0)
+    fixture.add_argument("--jitter", type=float, default=0.0)
+    fixture.add_argument("--error-rate", type=float, default=0.0)
+    fixture.add_argument("--replay", help="Directorio de respuestas grabadas")
+    fixture.add_argument("--record", help="Directorio donde grabar el API")
+
+    args = parser.parse_args(argv)
+
+    if getattr(args, "site", None) and args.command != "serve":
+        from src.api import API
+
+        API.use(args.site)
+
+    if not (args.profile or args.metrics):
+        return _dispatch(args)
+
+    from src import trace
+
+    sinks: list[trace.Sink] = []
+    collector = trace.Collector()
+    if args.profile:
+        sinks.append(collector)
+    if args.metrics and args.metrics.endswith(".prom"):
+        sinks.append(trace.PrometheusFile(args.metrics))
+    elif args.metrics:
+        sinks.append(trace.JSONLog(args.metrics))
+
+    with trace.profile(*sinks, memory=args.profile):
+        _dispatch(args)
+
+    if args.profile:
+        print(collector.table(), file=sys.stderr)
+
+
+def _dispatch(args: argparse.Namespace) -> None:
+    if args.command == "serve":
+        from src.service import serve as run
+        from src.store import SeriesStore
+
+        run(
+            host=args.host,
+            port=args.port,
+            site=args.site,
+            series=args.series,
+            refresh=args.refresh,
+            cache=SeriesStore(),
+        )
+    elif args.command == "fixture":
+        from src.fixture import serve as run
+
+        run(
+            host=args.host,
+            port=args.port,
+            rows=args.rows,
+            latency=args.latency,
+            jitter=args.jitter,
+            error_rate=args.error_rate,
+            replay=args.replay,
+            record=args.record,
+        )
+    elif args.command == "run":
+        from src.bcra import run as run_tasks
+
+        run_tasks(*args.targets, fmt=args.format)
+    else:
+        from src.bcra import main
+
+        main(getattr(args, "format", "console"))
 
 
 if __name__ == "__main__":
-    main()
+    cli()
@@ -1,63 +1,145 @@
-from src.docs import STDOUT, doble_template, week_var_template
-from src.dtypes import Endpoints
-from src.consignas import a, b, c, d
-from src.event_dolar import dolar_events_plot
-from src.regression import regression
+from functools import partial
+from typing import Any, Optional
+
+from src.event_dolar import events_job
+from src.regression import plot_job
 from src.dataclass import Data
+from src.cache import PlotCache, SectionCache
+from src.planner import Planner, Task
+from src.plots import PlotJob, render
+from src.store import SeriesStore
+from src.report import (
+    TITLES,
+    Format,
+    Report,
+    section_a,
+    section_b,
+    section_c,
+    section_d,
+    section_periods,
+    section_regression,
+)
+from src.window import Window
 
 
-def main() -> None:
-    """
-    Funcion que muestra por pantalla las consignas,
-    ejecutan las funciones del proyecto y guarda los plots
-    """
+# Tareas del reporte, cada una declara los endpoints que lee
+# y las tareas de las que depende
+def _year(data: Data) -> Window:
+    # Misma ventana para todas las consignas del ultimo año
+    return Window.last(days=365)
+
 
-    points: list[Endpoints] = [
-        "usd",
-        "usd_of",
-        "var_usd_vs_usd_of",
-        "inflacion_mensual_oficial",
-        "var_usd_anual",
-        "var_usd_of_anual",
-        "milestones",
-    ]
-
-    # Init data vars
-    data = Data()
-    data.call_api(*points)
-
-    # Formating Console output
-    out_a: str = a(data.var_usd_vs_usd_of)
-    out_b: str = doble_template.format(
-        *[
-            f"{i}          {j}"
-            for i, j in zip(
-                b(data.usd, "v").to_string().split("\n"),
-                b(data.usd_of, "v").to_string().split("\n"),
-            )
-        ]
+def _a(report: Report, data: Data, year: Window) -> dict:
+    return report.section("a", section_a, year.slice(data.var_usd_vs_usd_of))
+
+
+def _b(report: Report, data: Data, year: Window) -> dict:
+    return report.section(
+        "b", section_b, year.slice(data.usd), year.slice(data.usd_of)
     )
-    out_c: str = week_var_template % c(data.var_usd_vs_usd_of)
-    out_d: str = d(data.var_usd_vs_usd_of).to_string()
 
-    # Regresion sobre el dolar blue
-    out_reg_blue: str = regression(
-        data.usd, 3, verbose=True, save_plot="blue_regresion"
+
+def _c(report: Report, data: Data, year: Window) -> dict:
+    return report.section("c", section_c, year.slice(data.var_usd_vs_usd_of))
+
+
+def _d(report: Report, data: Data, year: Window) -> list:
+    return report.section("d", section_d, year.slice(data.var_usd_vs_usd_of))
+
+
+def _reg_blue(report: Report, data: Data) -> dict:
+    return report.section(
+        "reg_blue", section_regression, data.usd, (3, 6, 12)
+    )
+
+
+def _reg_oficial(report: Report, data: Data) -> dict:
+    return report.section(
+        "reg_oficial", section_regression, data.usd_of, (3, 6, 12)
     )
-    out_reg_blue += "\n" + regression(data.usd, 6)
-    out_reg_blue += "\n" + regression(data.usd, 12)
 
-    # Regresion sobre el dolar oficial
-    out_reg_of: str = regression(
-        data.usd_of, 3, verbose=True, save_plot="oficial_regresion"
+
+def _periods(report: Report, data: Data) -> list:
+    return report.section(
+        "periods", section_periods, data.usd, data.usd_of, data.milestones
     )
-    out_reg_of += "\n" + regression(data.usd_of, 6)
-    out_reg_of += "\n" + regression(data.usd_of, 12)
 
-    print(STDOUT.format(out_a, out_b, out_c, out_d, out_reg_blue, out_reg_of))
 
+def _plot_blue(data: Data) -> PlotJob:
+    return plot_job(data.usd, "blue_regresion")
+
+
+def _plot_oficial(data: Data) -> PlotJob:
+    return plot_job(data.usd_of, "oficial_regresion")
+
+
+def _events(data: Data) -> PlotJob:
     # Plot comparativo entre los eventos y el dolar
-    dolar_events_plot(data)
+    return events_job(data)
+
+
+def tasks(report: Report) -> tuple[Task, ...]:
+    """
+    Grafo de tareas del reporte, las secciones se guardan en report
+    """
+    return (
+        Task("year", _year),
+        Task("a", partial(_a, report), ("var_usd_vs_usd_of",), ("year",)),
+        Task("b", partial(_b, report), ("usd", "usd_of"), ("year",)),
+        Task("c", partial(_c, report), ("var_usd_vs_usd_of",), ("year",)),
+        Task("d", partial(_d, report), ("var_usd_vs_usd_of",), ("year",)),
+        Task("reg_blue", partial(_reg_blue, report), ("usd",)),
+        Task("reg_oficial", partial(_reg_oficial, report), ("usd_of",)),
+        Task(
+            "periods",
+            partial(_periods, report),
+            ("usd", "usd_of", "milestones"),
+        ),
+        Task("plot_blue", _plot_blue, ("usd",)),
+        Task("plot_oficial", _plot_oficial, ("usd_of",)),
+        Task("events", _events, ("usd", "usd_of", "milestones")),
+    )
+
+
+# Secciones de texto del reporte, en el orden de STDOUT
+SECTIONS: tuple[str, ...] = ("a", "b", "c", "d", "reg_blue", "reg_oficial")
+PLOTS: tuple[str, ...] = ("plot_blue", "plot_oficial", "events")
+
+
+def run(
+    *targets: str, fmt: Format = "console", report: Optional[Report] = None
+) -> Report:
+    """
+    Ejecuta solo las tareas pedidas y consulta solo sus endpoints.
+    Imprime las secciones pedidas en el formato elegido y renderiza
+    juntas, en paralelo, las figuras pedidas
+
+    Example
+    -------
+    >>> run("c", "d")       # solo consulta var_usd_vs_usd_of
+    >>> run("a", "b", fmt="json")
+    >>> run("periods")      # estadisticas por presidencia
+    """
+    report = report or Report(SectionCache())
+    results: dict[str, Any] = Planner(tasks(report)).run(
+        *targets, data=Data(cache=SeriesStore())
+    )
+    sections: list[str] = [t for t in targets if t in TITLES]
+    if sections:
+        print(report.render(fmt, sections))
+    render(
+        [results[t] for t in targets if isinstance(results[t], PlotJob)],
+        cache=PlotCache(),
+    )
+    return report
+
+
+def main(fmt: Format = "console") -> None:
+    """
+    Funcion que muestra por pantalla las consignas,
+    ejecutan las funciones del proyecto y guarda los plots
+    """
+    run(*SECTIONS, *PLOTS, fmt=fmt)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,371 @@
+import os
+import json
+import time
+import shutil
+import hashlib
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from pathlib import Path
+from typing import Any, Iterable, Optional
+
+from src.dtypes import Endpoints
+from src.schema import apply_schema
+
+
+CACHE_DIR: Path = Path(
+    os.environ.get("BCRA_CACHE_DIR", Path.home() / ".cache" / "api_bcra")
+)
+
+
+class SeriesCache:
+    """
+    Cache local en disco de las series del API, un archivo
+    columnar (.npz) por cada endpoint
+
+    Parameters
+    ----------
+    path: Path (Default CACHE_DIR)
+        Directorio donde se guardan los archivos,
+        se puede cambiar con la variable de entorno BCRA_CACHE_DIR
+    max_age: timedelta (Default 12 horas)
+        Ventana en la que un archivo se considera fresco,
+        pasado ese tiempo se vuelve a consultar el API
+
+    Example
+    -------
+    >>> cache = SeriesCache(max_age=dt.timedelta(hours=1))
+    >>> cache.is_fresh('usd')
+    False
+    >>> cache.merge('usd', to_dataframe(response_usd))
+               date         v
+    0    2000-05-24    1.0005
+    ...         ...       ...
+    """
+
+    def __init__(
+        self,
+        path: Path | str = CACHE_DIR,
+        max_age: dt.timedelta = dt.timedelta(hours=12),
+    ):
+        self.path = Path(path)
+        self.max_age = max_age
+
+    def path_of(self, point: Endpoints) -> Path:
+        return self.path / f"{point}.npz"
+
+    def is_fresh(self, point: Endpoints) -> bool:
+        """
+        True si el archivo existe y fue actualizado
+        dentro de la ventana max_age
+        """
+        file = self.path_of(point)
+        if not file.exists():
+            return False
+        age: float = time.time() - file.stat().st_mtime
+        return age <= self.max_age.total_seconds()
+
+    def load(self, point: Endpoints) -> Optional[pd.DataFrame]:
+        """
+        Lee la serie cacheada, None si no existe
+        """
+        file = self.path_of(point)
+        if not file.exists():
+            return None
+
+        with np.load(file, allow_pickle=False) as npz:
+            columns: dict[str, np.ndarray] = {k: npz[k] for k in npz.files}
+
+        return apply_schema(pd.DataFrame(columns), point)
+
+    def save(self, point: Endpoints, df: pd.DataFrame) -> None:
+        """
+        Guarda la serie, una columna por array.
+        Las columnas de texto se guardan como unicode
+        para no depender de pickle
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        columns: dict[str, np.ndarray] = {}
+        for col in df.columns:
+            values = df[col].to_numpy()
+            if values.dtype == object:
+                values = values.astype(str)
+            columns[col] = values
+
+        # Escritura atomica, otro proceso puede estar leyendo
+        tmp = self.path_of(point).with_suffix(".tmp.npz")
+        np.savez(tmp, **columns)
+        os.replace(tmp, self.path_of(point))
+
+    def touch(self, point: Endpoints) -> None:
+        """
+        Renueva la frescura del archivo sin reescribirlo
+        """
+        self.path_of(point).touch()
+
+    def merge(self, point: Endpoints, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Agrega al cache solo los registros con fecha posterior
+        al ultimo registro guardado y retorna la serie completa
+        """
+        cached: Optional[pd.DataFrame] = self.load(point)
+
+        if cached is None or cached.empty:
+            self.save(point, df)
+            return df
+
+        delta: pd.DataFrame = df.loc[df["date"] > cached["date"].max()]
+        if delta.empty:
+            self.touch(point)
+            return cached
+
+        merged: pd.DataFrame = apply_schema(
+            pd.concat([cached, delta], ignore_index=True), point
+        )
+        self.save(point, merged)
+        return merged
+
+    def clear(self, point: Optional[Endpoints] = None) -> None:
+        """
+        Borra un endpoint del cache o todo el cache
+        """
+        files = [self.path_of(point)] if point else self.path.glob("*.npz")
+        for file in files:
+            file.unlink(missing_ok=True)
+
+
+class PlotCache:
+    """
+    Cache de imagenes direccionado por contenido: cada figura se
+    guarda como <fingerprint>.png, si los datos y parametros no
+    cambiaron se reutiliza la imagen en vez de volver a dibujarla
+
+    Parameters
+    ----------
+    path: Path (Default CACHE_DIR / "plots")
+        Directorio de las imagenes
+    max_entries: int (Default 64)
+        Cantidad maxima de imagenes guardadas
+    max_bytes: int (Default 64 MB)
+        Tamaño maximo del directorio
+
+    Al superar cualquiera de los limites se borran
+    las imagenes usadas hace mas tiempo
+
+    Example
+    -------
+    >>> cache = PlotCache()
+    >>> cache.restore(key, "./plots/blue_regresion.png")
+    False
+    >>> cache.store(key, "./plots/blue_regresion.png")
+    >>> cache.restore(key, "./plots/blue_regresion.png")
+    True
+    """
+
+    def __init__(
+        self,
+        path: Path | str = CACHE_DIR / "plots",
+        max_entries: int = 64,
+        max_bytes: int = 64 * 2**20,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+    def path_of(self, key: str) -> Path:
+        return self.path / f"{key}.png"
+
+    def restore(self, key: str, target: Path | str) -> bool:
+        """
+        Deja en target una copia de la imagen cacheada,
+        False si no existe
+        """
+        file = self.path_of(key)
+        if not file.exists():
+            return False
+
+        # Marca de uso para la eviccion
+        file.touch()
+        _copy(file, Path(target))
+        return True
+
+    def store(self, key: str, source: Path | str) -> None:
+        """
+        Guarda la imagen recien dibujada y aplica los limites
+        """
+        self.path.mkdir(parents=True, exist_ok=True)
+
+        # Escritura atomica, otro proceso puede estar leyendo
+        tmp = self.path_of(key).with_suffix(".tmp.png")
+        shutil.copyfile(source, tmp)
+        os.replace(tmp, self.path_of(key))
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Borra las imagenes menos usadas hasta
+        respetar max_entries y max_bytes
+        """
+        _evict(self.path.glob("*.png"), self.max_entries, self.max_bytes)
+
+    def clear(self) -> None:
+        """
+        Borra todas las imagenes del cache
+        """
+        for file in self.path.glob("*.png"):
+            file.unlink(missing_ok=True)
+
+
+class SectionCache:
+    """
+    Cache de secciones del reporte: cada resultado se guarda como
+    <fingerprint>.json, la clave incluye las entradas de la seccion,
+    asi solo se recalculan las secciones cuya data cambio
+
+    Parameters
+    ----------
+    path: Path (Default CACHE_DIR / "sections")
+        Directorio de los resultados
+    max_entries: int (Default 256)
+        Cantidad maxima de resultados guardados,
+        se borran los usados hace mas tiempo
+
+    Example
+    -------
+    >>> cache = SectionCache()
+    >>> cache.get(key) is None
+    True
+    >>> cache.put(key, {"date": "2022-07-18"})
+    >>> cache.get(key)
+    {'date': '2022-07-18'}
+    """
+
+    def __init__(
+        self,
+        path: Path | str = CACHE_DIR / "sections",
+        max_entries: int = 256,
+    ):
+        self.path = Path(path)
+        self.max_entries = max_entries
+        self._memory: dict[str, Any] = {}
+
+    def path_of(self, key: str) -> Path:
+        return self.path / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Resultado guardado, None si no existe
+        """
+        if key in self._memory:
+            return self._memory[key]
+
+        file = self.path_of(key)
+        if not file.exists():
+            return None
+
+        # Marca de uso para la eviccion
+        file.touch()
+        self._memory[key] = json.loads(file.read_text())
+        return self._memory[key]
+
+    def put(self, key: str, value: Any) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._memory[key] = value
+
+        # Escritura atomica, otro proceso puede estar leyendo
+        tmp = self.path_of(key).with_suffix(".tmp")
+        tmp.write_text(json.dumps(value))
+        os.replace(tmp, self.path_of(key))
+        _evict(self.path.glob("*.json"), self.max_entries)
+
+    def clear(self) -> None:
+        """
+        Borra todos los resultados del cache
+        """
+        self._memory.clear()
+        for file in self.path.glob("*.json"):
+            file.unlink(missing_ok=True)
+
+
+def _evict(
+    files: Iterable[Path], max_entries: int, max_bytes: float = np.inf
+) -> None:
+    # Borra los archivos menos usados (mtime) hasta respetar los limites.
+    # Otro hilo o proceso puede estar borrando los mismos archivos
+    entries: list[tuple[float, int, Path]] = []
+    for file in files:
+        try:
+            stat = file.stat()
+        except FileNotFoundError:
+            continue
+        entries.append((stat.st_mtime, stat.st_size, file))
+    entries.sort()
+    size: int = sum(s for _, s, _ in entries)
+
+    for i, (_, bytes_, file) in enumerate(entries):
+        if len(entries) - i <= max_entries and size <= max_bytes:
+            break
+        try:
+            file.unlink()
+        except FileNotFoundError:
+            pass
+        size -= bytes_
+
+
+def _copy(source: Path, target: Path) -> None:
+    # Copia y no hard link: una escritura en el lugar sobre target
+    # (savefig abre el archivo existente) corromperia el cache
+    tmp = target.with_name(f".{target.name}.tmp")
+    shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
+
+
+def fingerprint(*parts: Any) -> str:
+    """
+    Hash del contenido de DataFrames, Series, arrays y parametros,
+    sirve como clave de cache: mismo contenido, mismo hash.
+    Los dict, listas y tuplas se recorren elemento a elemento
+
+    Example
+    -------
+    >>> fingerprint(data.usd, 3, "blue_regresion")
+    '5f0c1a9e8d...'
+    """
+    digest = hashlib.blake2b(digest_size=16)
+
+    for part in parts:
+        _feed(digest, part)
+
+    return digest.hexdigest()
+
+
+def _feed(digest: Any, part: Any) -> None:
+    if isinstance(part, pd.DataFrame):
+        for col in part.columns:
+            digest.update(str(col).encode())
+            _update(digest, part[col].to_numpy())
+    elif isinstance(part, (pd.Series, pd.Index, np.ndarray)):
+        _update(digest, np.asarray(part))
+    elif isinstance(part, dict):
+        digest.update(b"{")
+        for key in sorted(part, key=repr):
+            digest.update(repr(key).encode())
+            _feed(digest, part[key])
+    elif isinstance(part, (list, tuple)):
+        digest.update(b"[")
+        for item in part:
+            _feed(digest, item)
+    else:
+        digest.update(repr(part).encode())
+    digest.update(b"\x00")
+
+
+def _update(digest: Any, values: np.ndarray) -> None:
+    # Sin copiar el buffer, salvo columnas de texto que se hashean antes
+    if values.dtype == object:
+        values = pd.util.hash_array(values)
+    digest.update(values.dtype.str.encode())
+    digest.update(np.ascontiguousarray(values).reshape(-1).view(np.uint8))
@@ -2,10 +2,13 @@ import pandas as pd
 import numpy as np
 import datetime as dt
 
-from .dtypes import Frame, WeekSamples
+from typing import Optional
+
+from .dtypes import DateLike, Frame, WeekSamples
+from .window import Window
 
 # consignas
-def a(var_usd: pd.DataFrame) -> dt.datetime:
+def a(var_usd: pd.DataFrame, window: Optional[Window] = None) -> str:
     """
     Consigna:
     Retorna el Día con mayor variación
@@ -16,6 +19,8 @@ def a(var_usd: pd.DataFrame) -> dt.datetime:
     var_usd: DataFrame con columna 'v'.
         Variable a medir
         el mayor porcentaje de dicha columna
+    window: Window Opcional
+        Ventana a analizar, por defecto los ultimos 365 dias
 
     Return
     ------
@@ -33,7 +38,7 @@ def a(var_usd: pd.DataFrame) -> dt.datetime:
     >>> a(var_usd)
     2022-03-04
     """
-    last_var: pd.DataFrame = last_year(var_usd)
+    last_var: pd.DataFrame = (window or Window.last(days=365)).slice(var_usd)
 
     return (
         last_var.loc[last_var["v"] == last_var["v"].max(), "date"]
@@ -42,7 +47,9 @@ def a(var_usd: pd.DataFrame) -> dt.datetime:
     )
 
 
-def b(data: pd.DataFrame, col: str) -> Frame:
+def b(
+    data: pd.DataFrame, col: str, window: Optional[Window] = None
+) -> Frame:
     """
     Consigna:
     Retorna los 5 días con mayor volatilidad del ultimo año
@@ -56,6 +63,8 @@ def b(data: pd.DataFrame, col: str) -> Frame:
     col: str
         columna a procesar y calcular la volatilidad
         de cada una de sus filas
+    window: Window Opcional
+        Ventana a analizar, por defecto los ultimos 365 dias
 
     Return
     ------
@@ -79,18 +88,21 @@ def b(data: pd.DataFrame, col: str) -> Frame:
     3 2022-07-29    0.059034
     4 2022-07-20    0.051792
     """
-    vol: pd.DataFrame = last_year(data)
-    vol["volatility"] = abs(np.log(vol[col] / vol[col].shift()))
+    vol: pd.DataFrame = (window or Window.last(days=365)).slice(data)
+    volatility: pd.Series = abs(np.log(vol[col] / vol[col].shift()))
 
     return (
-        vol.sort_values(by="volatility", ascending=False)
-        .drop([col], axis=1)
+        vol.drop([col], axis=1)
+        .assign(volatility=volatility)
+        .sort_values(by="volatility", ascending=False)
         .head(5)
         .reset_index(drop=True)
     )
 
 
-def c(data_var: pd.DataFrame) -> tuple[str, str, float]:
+def c(
+    data_var: pd.DataFrame, window: Optional[Window] = None
+) -> tuple[str, str, float]:
     """
     Consigna:
     Semana con mayor variación en la brecha del ultimo año
@@ -98,6 +110,8 @@ def c(data_var: pd.DataFrame) -> tuple[str, str, float]:
     Parameter
     ---------
     data_var: DataFrame de variacion entre usd y usd_of
+    window: Window Opcional
+        Ventana a analizar, por defecto los ultimos 365 dias
 
     Return
     ------
@@ -114,7 +128,11 @@ def c(data_var: pd.DataFrame) -> tuple[str, str, float]:
     >>> c(data.var_usd_vs_usd_of)
     ('2022-07-18', '2022-07-22', 34.72449999999999)
     """
-    weeks: WeekSamples = last_year(data_var).resample("W-FRI", on="date")
+    weeks: WeekSamples = (
+        (window or Window.last(days=365))
+        .slice(data_var)
+        .resample("W-FRI", on="date")
+    )
     min_var: pd.Series = weeks.v.min()
     max_var: pd.Series = weeks.v.max()
 
@@ -123,8 +141,6 @@ def c(data_var: pd.DataFrame) -> tuple[str, str, float]:
 
     start_week = week_var.keys()[0] - last_week
 
-    data_var.tail(11)
-
     return (
         start_week.date().strftime("%Y-%m-%d"),
         week_var.keys()[0].date().strftime("%Y-%m-%d"),
@@ -132,7 +148,7 @@ def c(data_var: pd.DataFrame) -> tuple[str, str, float]:
     )
 
 
-def d(var_data: pd.DataFrame) -> pd.DataFrame:
+def d(var_data: pd.DataFrame, window: Optional[Window] = None) -> pd.DataFrame:
     """
     Consigna:
     Día de la semana donde hay mayor variación
@@ -143,6 +159,8 @@ def d(var_data: pd.DataFrame) -> pd.DataFrame:
     var_data: Dataframe con columna 'date' y 'v'
         Necesario para poder agrupar por los llamados weekdays
         y asi sacar un promedio de 'v'
+    window: Window Opcional
+        Ventana a analizar, por defecto los ultimos 365 dias
 
     Return
     ------
@@ -172,25 +190,32 @@ def d(var_data: pd.DataFrame) -> pd.DataFrame:
         4: "Viernes",
     }
 
-    last_data: pd.DataFrame = last_year(var_data)
-    weekday: pd.DataFrame = last_data.groupby(last_data.date.dt.weekday).mean()
+    last_data: pd.DataFrame = (window or Window.last(days=365)).slice(var_data)
+    weekday: pd.DataFrame = last_data.groupby(last_data.date.dt.weekday)[
+        ["v"]
+    ].mean()
 
     return weekday.rename(index=index_).sort_values(by="v", ascending=False)
 
 
-def last_year(data: pd.DataFrame) -> pd.DataFrame:
+def last_year(
+    data: pd.DataFrame, asof: Optional[DateLike] = None
+) -> pd.DataFrame:
     """
-    Filtro para dataframes, que toma los datos del ultimo año
+    Filtro para dataframes, que toma los datos del ultimo año.
+    Atajo de Window.last(days=365).slice(data)
 
     Parameter
     ---------
     data: DataFrame
-        Este dataframe debe contener una columna llamada date
-        y estar en formato datetime
+        Este dataframe debe contener una columna llamada date,
+        estar en formato datetime y ordenado por fecha
+    asof: fecha Opcional
+        Fecha de referencia, por defecto hoy
 
     Return
     ------
-    DataFrame con registros del ultimo año
+    Vista del DataFrame con registros del ultimo año
 
     Example
     -------
@@ -204,17 +229,14 @@ def last_year(data: pd.DataFrame) -> pd.DataFrame:
     5564 2022-08-02  291.0000
     5565 2022-08-03  298.0000
 
-    >>> last_year(data.usd)
-              date      v
-    0   2021-08-05  180.5
-    1   2021-08-06  178.5
-    2   2021-08-09  179.0
-    ..         ...    ...
-    241 2022-08-01  282.0
-    242 2022-08-02  291.0
-    243 2022-08-03  298.0
+    >>> last_year(data.usd, asof="2022-08-04")
+               date      v
+    5322 2021-08-05  180.5
+    5323 2021-08-06  178.5
+    5324 2021-08-09  179.0
+    ...         ...    ...
+    5563 2022-08-01  282.0
+    5564 2022-08-02  291.0
+    5565 2022-08-03  298.0
     """
-    day_365 = dt.datetime.today() - dt.timedelta(days=365)
-    return (
-        data.loc[data["date"] >= day_365].reset_index().drop("index", axis=1)
-    )
+    return Window.last(days=365, asof=asof).slice(data)
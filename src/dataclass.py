@@ -1,14 +1,23 @@
+import asyncio
+import typing as T
+
 import pandas as pd
-import numpy as np
 
 from typing import Optional
 
 from src.dtypes import JSON, Endpoints
 from src.api import API
+from src.cache import SeriesCache
+from src.schema import apply_schema
+from src.panel import Align, Panel
+from src import trace
 
 
 def to_dataframe(
-    data: JSON, v: Optional[str] = None, col: Optional[dict] = None
+    data: JSON,
+    v: Optional[str] = None,
+    col: Optional[dict] = None,
+    point: Optional[Endpoints] = None,
 ) -> pd.DataFrame:
     """
     Esta funcion convierte en dataframe los response del API
@@ -16,13 +25,17 @@ def to_dataframe(
     Parameter
     ---------
     data: JSON
-        Este debe ser el dato que el api nos devuelve
+        Este debe ser el dato que el api nos devuelve,
+        o las columnas ya decodificadas por SeriesDecoder
     v: Optional - string
         Nuevo nombre de la columna caracteristica
         de esta API "v"
     col: Optional - dict
         Diccionario con los nombres de la columna
         del dataframe como key y el nuevo nombre como value
+    point: Optional - Endpoints
+        Endpoint de origen, define los tipos de las columnas
+        segun src.schema.SCHEMAS
 
     Return
     ------
@@ -64,26 +77,90 @@ def to_dataframe(
     0 1991-02-05  Roque Fernández  bcra
     """
 
-    columns: dict[str, str] = {"d": "date"}
+    columns: dict[str, str] = {}
     if v:
         columns["v"] = v
     if col:
         columns.update(col)
 
-    df: pd.DataFrame = pd.DataFrame(data).rename(columns=columns)
-    df["date"] = pd.to_datetime(df["date"]).dt.date.astype(np.datetime64)
+    with trace.span("frame", point or "-") as span:
+        df: pd.DataFrame = pd.DataFrame(data).rename(columns={"d": "date"})
+        df = apply_schema(df, point).rename(columns=columns)
+        span.record(rows=len(df))
     return df
 
 
+ENDPOINTS: frozenset[Endpoints] = frozenset(T.get_args(Endpoints))
+
+
 class Data(dict):
-    def __init__(self, *args, **kwargs):
+    """
+    AttribDict con los dataframes del API, indexado por endpoint.
+    Los endpoints se consultan la primera vez que se acceden
+    (data.reservas) y quedan memorizados
+
+    Parameters
+    ----------
+    cache: SeriesCache Opcional
+        Cache en disco usado por defecto en cada consulta
+
+    Example
+    -------
+    >>> data = Data(cache=SeriesCache())
+    >>> data.usd  # consulta 'usd'
+    >>> data.usd  # ya memorizado, no consulta
+    >>> data.call_api('usd', 'usd_of')  # solo consulta 'usd_of'
+    """
+
+    def __init__(self, *args, cache: Optional[SeriesCache] = None, **kwargs):
         super(Data, self).__init__(*args, **kwargs)
-        self.__dict__ = self
+        self._cache: Optional[SeriesCache] = cache
+        # Batch del tick actual, un grupo por cache
+        self._pending: dict[
+            Optional[SeriesCache], dict[Endpoints, asyncio.Future]
+        ] = {}
+        # Referencias a los batches en curso, el loop solo guarda
+        # referencias debiles a las tareas
+        self._tasks: set[asyncio.Task] = set()
+        self._panels: dict[tuple, Panel] = {}
+
+    def __getattr__(self, name: str) -> pd.DataFrame:
+        # Solo se llama cuando el atributo no existe en la instancia
+        if name in self:
+            return self[name]
+        if name in ENDPOINTS:
+            self.call_api(name)
+            return self[name]
+        raise AttributeError(
+            f"'{type(self).__name__}' object has no attribute '{name}'"
+        )
+
+    def panel(self, *points: Endpoints, how: Align = "inner") -> Panel:
+        """
+        Panel alineado con los endpoints pedidos, se calcula
+        una sola vez por combinacion de endpoints y politica
+
+        Example
+        -------
+        >>> dolars = data.panel('usd', 'usd_of').frame()
+        >>> dolars.usd / dolars.usd_of
+        """
+        key: tuple = (points, how)
+        if key not in self._panels:
+            self.call_api(*points)
+            self._panels[key] = Panel.from_data(self, *points, how=how)
+        return self._panels[key]
 
-    def call_api(self, *points: Endpoints, jupyter: bool = False):
+    def call_api(
+        self,
+        *points: Endpoints,
+        jupyter: bool = False,
+        cache: Optional[SeriesCache] = None,
+    ):
         """
         Extraer la data proveniente
-        de la API estadisticasbcra.com
+        de la API estadisticasbcra.com.
+        Solo se consultan los endpoints que todavia no estan cargados
 
         Parameter
         ---------
@@ -92,8 +169,15 @@ class Data(dict):
             correspondientes a el API
             https://estadisticasbcra.com/api/documentacion
         jupyter: bool (default False)
-            Habilita las consultas en jupyter a costa de codigo
-            NO asyncronico
+            Obsoleto, se ignora: query detecta si ya hay
+            un loop corriendo. Dentro de un loop es preferible
+            usar acall_api
+        cache: SeriesCache Opcional
+            Si se pasa, los endpoints frescos se leen del disco
+            y solo se consultan al API los vencidos, agregando
+            al cache las fechas nuevas. Si el API falla se usa
+            la copia vencida del cache.
+            Por defecto el cache con el que se creo Data
 
         Examples
         --------
@@ -108,21 +192,162 @@ class Data(dict):
         Una buena practica seria
         ejecutar el codigo de la siguiente forma
         >>> data = Data()
-        >>> data.call_api('usd', 'usd_of')
+        >>> data.call_api('usd', 'usd_of', cache=SeriesCache())
         >>> usd: pd.DataFrame = data.usd
         >>> usd_of: pd.DataFrame = data.usd_of
         """
-        if not self.__dict__:
-            api: API = API()
+        cache = cache or self._cache
+        missing: list[Endpoints] = [
+            p for p in dict.fromkeys(points) if p not in self
+        ]
+
+        if missing:
+            content, stale = self._from_cache(missing, cache)
+
+            if stale:
+                try:
+                    resp = API().query(*stale)
+                except Exception:
+                    if not self._cached(stale, cache):
+                        raise
+                    resp = None
+
+                self._fill(content, stale, resp, cache)
+
+            self.update(content)
+        return self
+
+    async def acall_api(
+        self, *points: Endpoints, cache: Optional[SeriesCache] = None
+    ):
+        """
+        Version asincronica de call_api, para usar
+        dentro de un loop ya corriendo. Los endpoints pedidos
+        en el mismo tick del loop, por esta u otras llamadas,
+        se consultan juntos en un solo batch concurrente
 
-            if jupyter:
-                resp = api.jupyter_query(*points)
-            else:
-                resp = api.query(*points)
+        Example
+        -------
+        >>> data = Data()
+        >>> await data.acall_api('usd', 'usd_of')
+        >>> usd: pd.DataFrame = data.usd
+        """
+        futures = [self._schedule(p, cache) for p in points]
+        await asyncio.gather(*[asyncio.shield(f) for f in futures])
+        return self
 
-            content: list[pd.DataFrame] = [to_dataframe(json) for json in resp]
+    async def aget(
+        self, point: Endpoints, cache: Optional[SeriesCache] = None
+    ) -> pd.DataFrame:
+        """
+        Retorna el endpoint, consultandolo si no esta cargado
 
-            data = dict(zip(points, content))
+        Example
+        -------
+        >>> usd, usd_of = await asyncio.gather(
+        ...     data.aget('usd'), data.aget('usd_of')
+        ... )  # un solo batch
+        """
+        return await asyncio.shield(self._schedule(point, cache))
+
+    def _schedule(
+        self, point: Endpoints, cache: Optional[SeriesCache]
+    ) -> asyncio.Future:
+        """
+        Registra el endpoint en el batch del tick actual,
+        sincronicamente para que entren todos los pedidos del tick
+        """
+        loop = asyncio.get_running_loop()
+
+        if point in self:
+            future = loop.create_future()
+            future.set_result(self[point])
+            return future
+
+        if not self._pending:
+            loop.call_soon(self._flush)
+        # Cada pedido se resuelve con su propio cache
+        batch = self._pending.setdefault(cache or self._cache, {})
+        if point not in batch:
+            batch[point] = loop.create_future()
+
+        return batch[point]
+
+    def _flush(self) -> None:
+        """
+        Lanza todo lo pedido en el tick, un batch por cache
+        """
+        pending, self._pending = self._pending, {}
+        for cache, batch in pending.items():
+            task = asyncio.ensure_future(self._afetch(batch, cache))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _afetch(
+        self,
+        batch: dict[Endpoints, asyncio.Future],
+        cache: Optional[SeriesCache],
+    ) -> None:
+        points: list[Endpoints] = list(batch)
+
+        try:
+            content, stale = self._from_cache(points, cache)
+
+            if stale:
+                try:
+                    resp = await API().aquery(*stale)
+                except Exception:
+                    if not self._cached(stale, cache):
+                        raise
+                    resp = None
+
+                self._fill(content, stale, resp, cache)
+
+        except Exception as err:
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(err)
+            return
+
+        self.update(content)
+        for point, future in batch.items():
+            if not future.done():
+                future.set_result(content[point])
+
+    @staticmethod
+    def _from_cache(
+        points: list[Endpoints], cache: Optional[SeriesCache]
+    ) -> tuple[dict[Endpoints, pd.DataFrame], list[Endpoints]]:
+        """
+        Separa los endpoints frescos en cache (ya leidos)
+        de los que hay que consultar al API
+        """
+        if not cache:
+            return {}, list(points)
+
+        content = {p: cache.load(p) for p in points if cache.is_fresh(p)}
+        return content, [p for p in points if p not in content]
+
+    @staticmethod
+    def _cached(points: list[Endpoints], cache: Optional[SeriesCache]) -> bool:
+        return bool(cache) and all(cache.path_of(p).exists() for p in points)
+
+    @staticmethod
+    def _fill(
+        content: dict[Endpoints, pd.DataFrame],
+        points: list[Endpoints],
+        resp: Optional[list[JSON]],
+        cache: Optional[SeriesCache],
+    ) -> None:
+        """
+        Convierte los responses y los mezcla con el cache.
+        Sin response (API caido) se usa la copia vencida
+        """
+        for i, point in enumerate(points):
+            if resp is None:
+                # El API no responde, se usa la copia vencida
+                content[point] = cache.load(point)
+                continue
 
-            super(Data, self).__init__(data)
-            return self
+            df: pd.DataFrame = to_dataframe(resp[i], point=point)
+            content[point] = cache.merge(point, df) if cache else df
@@ -0,0 +1,116 @@
+import re
+
+import numpy as np
+
+
+_DATE = re.compile(r'"d"\s*:\s*"([^"]*)"')
+_VALUE = re.compile(r'"v"\s*:\s*([^,}\s]+)')
+
+
+class SeriesDecoder:
+    """
+    Decodificador incremental de las series del API.
+    Recibe el body en pedazos y va llenando dos arrays
+    preasignados (datetime64 y float64) sin crear
+    un diccionario por observacion
+
+    Parameters
+    ----------
+    capacity: int (Default 8192)
+        Tamaño inicial de los arrays, se duplica cuando se llena
+
+    Example
+    -------
+    >>> decoder = SeriesDecoder()
+    >>> decoder.feed(b'[{"d":"2000-05-24","v":1.0005},{"d":"2000-')
+    >>> decoder.feed(b'05-25","v":1.0005}]')
+    >>> decoder.close()
+    {'d': array(['2000-05-24', '2000-05-25'], dtype='datetime64[D]'),
+     'v': array([1.0005, 1.0005])}
+    """
+
+    def __init__(self, capacity: int = 8192):
+        self.dates: np.ndarray = np.empty(capacity, dtype="datetime64[D]")
+        self.values: np.ndarray = np.empty(capacity, dtype=np.float64)
+        self.size: int = 0
+        self._tail: bytes = b""
+        self._objects: bool = False
+
+    def feed(self, chunk: bytes) -> None:
+        """
+        Procesa los objetos completos del pedazo y guarda
+        el resto para el proximo llamado
+        """
+        buffer: bytes = self._tail + chunk
+        end: int = buffer.rfind(b"}") + 1
+        self._tail = buffer[end:]
+
+        if end:
+            # '}' es ascii, nunca corta un caracter utf-8 a la mitad
+            self._objects = True
+            self._parse(buffer[:end].decode())
+
+    def close(self) -> dict[str, np.ndarray]:
+        """
+        Retorna las columnas decodificadas (vistas, sin copia)
+        """
+        if self._tail.strip(b" \n\r\t[]"):
+            raise ValueError("Body incompleto: %r" % self._tail[:64])
+        # Un objeto sin registros es un error del API ({"error": ...}),
+        # no una serie vacia
+        if self._objects and not self.size:
+            raise ValueError("El body no contiene registros 'd' y 'v'")
+
+        return {"d": self.dates[: self.size], "v": self.values[: self.size]}
+
+    def _parse(self, text: str) -> None:
+        dates: list[str] = _DATE.findall(text)
+        values: list[str] = _VALUE.findall(text.replace("null", "NaN"))
+
+        if len(dates) != len(values):
+            raise ValueError("Las observaciones deben tener 'd' y 'v'")
+        if not dates:
+            return
+
+        n: int = len(dates)
+        self._reserve(self.size + n)
+
+        chunk = slice(self.size, self.size + n)
+        self.dates[chunk] = np.array(dates, dtype="datetime64[D]")
+        try:
+            self.values[chunk] = np.array(values, dtype=np.float64)
+        except ValueError:
+            raise ValueError(
+                "Valores 'v' no numericos: %r" % values[:5]
+            ) from None
+        self.size += n
+
+    def _reserve(self, size: int) -> None:
+        capacity: int = max(len(self.values), 1)
+        if size <= capacity:
+            return
+
+        while capacity < size:
+            capacity *= 2
+
+        dates = np.empty(capacity, dtype="datetime64[D]")
+        values = np.empty(capacity, dtype=np.float64)
+        dates[: self.size] = self.dates[: self.size]
+        values[: self.size] = self.values[: self.size]
+        self.dates, self.values = dates, values
+
+
+def decode(body: bytes, chunk_size: int = 1 << 16) -> dict[str, np.ndarray]:
+    """
+    Decodifica un body completo en columnas
+
+    Example
+    -------
+    >>> decode(b'[{"d":"2000-05-24","v":1.0005}]')
+    {'d': array(['2000-05-24'], dtype='datetime64[D]'),
+     'v': array([1.0005])}
+    """
+    decoder = SeriesDecoder()
+    for i in range(0, len(body), chunk_size):
+        decoder.feed(body[i : i + chunk_size])
+    return decoder.close()
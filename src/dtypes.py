@@ -1,28 +1,27 @@
+from __future__ import annotations
+
 import typing as T
-import numpy as np
-import pandas as pd
 
+# Solo para los type checkers: los alias de abajo son strings
+# para que importar este modulo no cargue numpy, pandas ni aiohttp
+if T.TYPE_CHECKING:
+    import datetime as dt
 
-import aiohttp
-import asyncio
+    import aiohttp
+    import numpy as np
+    import pandas as pd
 
-from dataclasses import dataclass
-from pandas.core import resample
+    from pandas.core import resample
 
 JSON: T.TypeAlias = None | int | str | bool | list[T.Any] | dict[T.Any, T.Any]
 JSONList: T.TypeAlias = list[JSON]
 Coroutine: T.TypeAlias = T.Coroutine
-HTTPSession: T.TypeAlias = aiohttp.ClientSession
-WeekSamples: T.TypeAlias = resample.Resampler
-MonthSamples: T.TypeAlias = resample.Resampler
+HTTPSession: T.TypeAlias = "aiohttp.ClientSession"
+WeekSamples: T.TypeAlias = "resample.Resampler"
+MonthSamples: T.TypeAlias = "resample.Resampler"
 JSONapi: T.TypeAlias = list[T.Coroutine[T.Any, T.Any, list[JSON]]]
-Frame: T.TypeAlias = pd.DataFrame | pd.Series
-
-
-@dataclass(slots=True, frozen=True)
-class UsdType:
-    date: np.datetime64
-    price: np.float16
+Frame: T.TypeAlias = "pd.DataFrame | pd.Series"
+DateLike: T.TypeAlias = "dt.date | dt.datetime | np.datetime64 | str"
 
 
 Endpoints: T.TypeAlias = T.Literal[
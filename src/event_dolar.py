@@ -1,9 +1,9 @@
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import matplotlib
 
 from src.dataclass import Data
+from src.periods import assign, periods
+from src.plots import PlotJob, draw_events, render, show
 
 
 def dolars_month_gen(data: Data) -> pd.DataFrame:
@@ -11,13 +11,13 @@ def dolars_month_gen(data: Data) -> pd.DataFrame:
     Funcion que genera un dataframe con los valores
     de los diferentes dolares y los agrupa por mes
     """
-    dolars: pd.DataFrame = pd.merge(data.usd, data.usd_of, on="date").rename(
-        columns={"v_x": "blue", "v_y": "oficial"}
+    dolars: pd.DataFrame = (
+        data.panel("usd", "usd_of")
+        .frame()
+        .rename(columns={"usd": "blue", "usd_of": "oficial"})
     )
 
-    dmonth: pd.DataFrame = (
-        dolars.resample("MS", on="date").mean().reset_index()
-    )
+    dmonth: pd.DataFrame = dolars.resample("MS").mean().reset_index()
     return dmonth
 
 
@@ -33,36 +33,23 @@ def politic_gen(data: Data) -> pd.DataFrame:
     )
 
 
-def dolar_events_plot(data: Data, plot: bool = False) -> None:
+def events_job(data: Data, path: str = "./plots/dolar_events.png") -> PlotJob:
     """
-    Consigna: Con la info histórica del valor del dólar y del blue,
-    realizar un análisis exploratorio. Cruzar la data con sucesos importantes
-    a nivel político-económico y graficar mes a mes.
-
-    Parameter
-    ---------
-    data: Data
-        AttribDict que contiene
-        todos los dataframes que consultamos a la API
+    Calcula los datos del plot de eventos y retorna la
+    figura lista para renderizar con plots.render, por defecto
+    en ./plots como el resto de las figuras.
+    Los eventos se recortan al rango del dolar y las etiquetas
+    salen de los periodos presidenciales de milestones
     """
     dolar_month: pd.DataFrame = dolars_month_gen(data)
-    politic: pd.DataFrame = politic_gen(data)
-    politic_month: pd.DataFrame = politic_gen(data)
-
-    politic_month.date = (
-        politic_gen(data).date.dt.strftime("%Y%m").astype({"date": np.int32})
-    )
-
-    politic_dolar: pd.DataFrame = (
-        pd.merge(dolar_month, politic, on="date", how="left")
-        .fillna(method="ffill")
-        .dropna()
-    ).rename(columns={"e": "nombre", "t": "entidad"})
+    pres: pd.DataFrame = periods(data.milestones, ["pres"])
 
-    # borro registros de antes del 2002 07 -- Cuidado! recursivo
-    politic_month = politic_month.drop(index=np.arange(0, 20)).reset_index(
-        drop=True
-    )
+    # Solo los meses con un presidente vigente
+    dolar_month = dolar_month[
+        assign(dolar_month.date.values, pres.start.values) >= 0
+    ]
+    months: np.ndarray = _days(dolar_month.date.values)
+    first, last = (months.min(), months.max()) if len(months) else (0, 0)
 
     colors = {
         "econ": "royalblue",
@@ -72,39 +59,67 @@ def dolar_events_plot(data: Data, plot: bool = False) -> None:
         "trea": "silver",
     }
 
-    _, ax1 = plt.subplots()
-    i = -1
-    x_ticks = list()
-
-    for be, ne in zip(politic_month.date.shift(), politic_month.date):
-        i += 1
-        if politic_month.entidad.iloc[i] == "pres":
-            x_ticks.append(politic_month.date.iloc[i])
-            ax1.axvline(be, color="teal", linestyle="--")
-        else:
-            color: str = colors[politic_month.entidad.iloc[i]]
-            ax1.axvspan(be, ne, facecolor=color, alpha=0.5)
-
-    ax2 = ax1.twiny()
-
-    ax2.plot(politic_dolar.date, politic_dolar.blue, color="black")
-    ax2.plot(politic_dolar.date, politic_dolar.oficial, color="grey")
-
-    # Config
-    ax1.set_xticks(x_ticks)
-    ax1.set_xticklabels(["Nestor", "Cristina", "Cristina", "Macri", "Alberto"])
-    ax2.set_yscale("log")
-    ax2.set_yticks([5, 10, 20, 40, 80, 160, 300])
-    ax2.get_yaxis().set_major_formatter(matplotlib.ticker.ScalarFormatter())
-
-    ax2.legend(
-        ["Dolar Blue", "Dolar Oficial"], loc="lower right", frameon=True
+    # Cada evento va desde el evento anterior hasta su fecha,
+    # recortado al inicio del dolar
+    events: pd.DataFrame = data.milestones.sort_values("date", kind="stable")
+    end: np.ndarray = _days(events.date.values)
+    start: np.ndarray = np.fmax(np.r_[np.nan, end[:-1]], first)
+    entity: np.ndarray = events.t.values.astype(str)
+    shown: np.ndarray = end > start
+
+    spans: dict[str, tuple[np.ndarray, np.ndarray]] = {}
+    for name in colors:
+        mask: np.ndarray = (entity == name) & shown
+        if mask.any():
+            spans[name] = (start[mask], end[mask] - start[mask])
+
+    # Presidencias dentro del rango, con el nombre al medio del periodo
+    # El presidente en ejercicio (end NaT) llega hasta el final
+    terms: np.ndarray = _days(pres.start.values)
+    until: np.ndarray = np.fmin(
+        np.where(np.isnat(pres.end.values), last, _days(pres.end.values)),
+        last,
+    )
+    visible: np.ndarray = (until > first) & (terms < last)
+    ticks: np.ndarray = (np.fmax(terms, first) + until)[visible] / 2
+
+    return PlotJob(
+        draw_events,
+        path,
+        dict(
+            dates=dolar_month.date.values,
+            blue=dolar_month.blue.values,
+            oficial=dolar_month.oficial.values,
+            spans=spans,
+            colors=colors,
+            pres=terms[(terms > first) & (terms < last)],
+            ticks=ticks,
+            labels=[n.split()[0] for n in pres.name.values[visible]],
+        ),
     )
 
-    plt.xlabel("Dolar vs Eventos politicos")
-    plt.savefig("../plots/dolar_events.png")
+
+def _days(dates: np.ndarray) -> np.ndarray:
+    # Dias desde 1970-01-01, las unidades de fecha de matplotlib
+    return dates.astype("datetime64[D]").astype(np.float64)
+
+
+def dolar_events_plot(data: Data, plot: bool = False) -> None:
+    """
+    Consigna: Con la info histórica del valor del dólar y del blue,
+    realizar un análisis exploratorio. Cruzar la data con sucesos importantes
+    a nivel político-económico y graficar mes a mes.
+
+    Parameter
+    ---------
+    data: Data
+        AttribDict que contiene
+        todos los dataframes que consultamos a la API
+    plot: bool (Default False)
+        Llamar True para ademas mostrar el plot
+    """
+    job: PlotJob = events_job(data)
+    render([job])
 
     if plot:
-        plt.show()
-    plt.cla()
-    plt.clf()
+        show(job)
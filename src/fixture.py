@@ -0,0 +1,170 @@
+import json
+import random
+import asyncio
+import threading
+
+from aiohttp import ClientSession, web
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+from src.api import API, TOKEN
+from src.synthetic import body
+
+
+class FixtureServer:
+    """
+    Servidor local que reemplaza a api.estadisticasbcra.com para
+    probar y medir el camino de consulta sin gastar la cuota del API
+
+    Cada endpoint se responde, en orden de prioridad, con:
+    1. la respuesta grabada en replay/<endpoint>.json
+    2. la respuesta del API real, grabandola en record/<endpoint>.json
+    3. una respuesta sintetica de rows registros
+
+    Parameters
+    ----------
+    rows: int (Default 6000)
+        Registros de las respuestas sinteticas
+    latency: float (Default 0)
+        Segundos de demora de cada respuesta
+    jitter: float (Default 0)
+        Segundos de demora extra, uniforme entre 0 y jitter
+    error_rate: float (Default 0)
+        Probabilidad de responder 503 con Retry-After: 0
+    replay: Path Opcional
+        Directorio con respuestas grabadas
+    record: Path Opcional
+        Directorio donde grabar las respuestas del API real
+    upstream: string (Default API.site)
+        API real usado al grabar
+    seed: int Opcional
+        Semilla de la latencia y los errores, para repetir corridas
+
+    Example
+    -------
+    >>> with FixtureServer(latency=0.05, error_rate=0.1).running() as site:
+    ...     API.use(site)
+    ...     Data().call_api('usd', 'usd_of')
+
+    $ python -m src fixture --port 8081 --record ./recorded
+    $ python -m src report --site http://127.0.0.1:8081/
+    """
+
+    def __init__(
+        self,
+        rows: int = 6000,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        replay: Optional[Path | str] = None,
+        record: Optional[Path | str] = None,
+        upstream: str = API.site,
+        seed: Optional[int] = None,
+    ):
+        self.rows = rows
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.replay: Optional[Path] = Path(replay) if replay else None
+        self.record: Optional[Path] = Path(record) if record else None
+        self.upstream = upstream
+
+        self.requests: int = 0
+        self.errors: int = 0
+
+        self._random = random.Random(seed)
+        self._bodies: dict[str, bytes] = {}
+        self._session: Optional[ClientSession] = None
+
+    async def endpoint(self, request: web.Request) -> web.Response:
+        point: str = request.match_info["point"]
+        self.requests += 1
+
+        delay: float = self.latency + self._random.uniform(0, self.jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._random.random() < self.error_rate:
+            self.errors += 1
+            raise web.HTTPServiceUnavailable(headers={"Retry-After": "0"})
+
+        return web.Response(
+            body=await self.body(point), content_type="application/json"
+        )
+
+    async def body(self, point: str) -> bytes:
+        """
+        Body del endpoint, se arma una sola vez y queda en memoria
+        """
+        if point not in self._bodies:
+            self._bodies[point] = await self._load(point)
+        return self._bodies[point]
+
+    async def _load(self, point: str) -> bytes:
+        if self.replay and (self.replay / f"{point}.json").exists():
+            return (self.replay / f"{point}.json").read_bytes()
+
+        if self.record:
+            content: bytes = await self._fetch(point)
+            self.record.mkdir(parents=True, exist_ok=True)
+            (self.record / f"{point}.json").write_bytes(content)
+            return content
+
+        return body(point, self.rows)
+
+    async def _fetch(self, point: str) -> bytes:
+        if self._session is None:
+            self._session = ClientSession()
+        async with self._session.get(
+            self.upstream + point,
+            headers={"Authorization": "BEARER " + (API.token or TOKEN)},
+        ) as response:
+            response.raise_for_status()
+            content: bytes = await response.read()
+
+        # Valida que sea JSON antes de grabarlo
+        json.loads(content)
+        return content
+
+    async def _close(self, app: web.Application) -> None:
+        if self._session:
+            await self._session.close()
+            self._session = None
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/{point}", self.endpoint)
+        app.on_cleanup.append(self._close)
+        return app
+
+    @contextmanager
+    def running(self, host: str = "127.0.0.1", port: int = 0) -> Iterator[str]:
+        """
+        Levanta el servidor en un hilo con su propio loop y retorna
+        la url base, para usarlo desde codigo sincronico.
+        Con port=0 se elige un puerto libre
+        """
+        loop = asyncio.new_event_loop()
+        runner = web.AppRunner(self.app())
+
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, host, port).start())
+        port = runner.addresses[0][1]
+
+        thread = threading.Thread(target=loop.run_forever, daemon=True)
+        thread.start()
+        try:
+            yield f"http://{host}:{port}/"
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.run_until_complete(runner.cleanup())
+            loop.close()
+
+
+def serve(host: str = "127.0.0.1", port: int = 8081, **kwargs) -> None:
+    """
+    Levanta el servidor de prueba en primer plano
+    """
+    web.run_app(FixtureServer(**kwargs).app(), host=host, port=port)
@@ -0,0 +1,143 @@
+import typing as T
+
+import numpy as np
+import pandas as pd
+
+from functools import reduce
+
+from src.dtypes import Endpoints
+
+
+Align: T.TypeAlias = T.Literal["inner", "outer", "ffill"]
+
+
+class Panel:
+    """
+    Varias series alineadas sobre un unico DatetimeIndex ordenado.
+    Los valores viven en un solo array 2D en orden Fortran,
+    asi cada columna es contigua y se expone sin copiar
+
+    Parameters
+    ----------
+    frames: dict
+        Nombre de la serie como key y DataFrame con
+        columnas 'date' y col como value
+    how: string (Default "inner")
+        Politica de alineacion
+        inner: solo las fechas presentes en todas las series
+        outer: todas las fechas, NaN donde una serie no tiene dato
+        ffill: como outer pero arrastrando el ultimo dato conocido
+    col: string (Default "v")
+        Columna de valores de cada DataFrame
+
+    Example
+    -------
+    >>> panel = Panel({'usd': data.usd, 'usd_of': data.usd_of})
+    >>> panel['usd']
+    date
+    2002-03-04      2.1200
+    ...
+    >>> panel.frame()
+                    usd   usd_of
+    date
+    2002-03-04   2.1200   1.9500
+    ...
+    """
+
+    def __init__(
+        self,
+        frames: dict[str, pd.DataFrame],
+        how: Align = "inner",
+        col: str = "v",
+    ):
+        if how not in T.get_args(Align):
+            raise ValueError(f"how debe ser uno de {T.get_args(Align)}")
+
+        series: dict[str, tuple[np.ndarray, np.ndarray]] = {
+            name: _sorted(df["date"].values, df[col].values)
+            for name, df in frames.items()
+        }
+        dates: list[np.ndarray] = [d for d, _ in series.values()]
+
+        if how == "inner":
+            index = reduce(np.intersect1d, dates) if dates else dates
+        else:
+            index = np.unique(np.concatenate(dates)) if dates else dates
+
+        self.how: Align = how
+        self.names: list[str] = list(series)
+        self.index: pd.DatetimeIndex = pd.DatetimeIndex(index, name="date")
+        self.values: np.ndarray = np.full(
+            (len(self.index), len(self.names)), np.nan, order="F"
+        )
+
+        keys: np.ndarray = self.index.values
+        for j, (date, value) in enumerate(series.values()):
+            pos: np.ndarray = np.searchsorted(keys, date)
+            found: np.ndarray = pos < len(keys)
+            found[found] = keys[pos[found]] == date[found]
+            self.values[pos[found], j] = value[found]
+
+        if how == "ffill":
+            self.values = _ffill(self.values)
+
+    @classmethod
+    def from_data(
+        cls, data: dict, *points: Endpoints, how: Align = "inner"
+    ) -> "Panel":
+        """
+        Panel con los endpoints de un Data
+        """
+        return cls({p: getattr(data, p) for p in points}, how=how)
+
+    def __getitem__(self, name: str) -> pd.Series:
+        """
+        Vista de una columna, sin copia
+        """
+        return pd.Series(
+            self.values[:, self.names.index(name)],
+            index=self.index,
+            name=name,
+            copy=False,
+        )
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.names
+
+    def __len__(self) -> int:
+        return len(self.index)
+
+    def frame(self, *names: str) -> pd.DataFrame:
+        """
+        DataFrame indexado por fecha. Sin nombres retorna
+        todas las columnas sin copiar el array
+        """
+        if not names or list(names) == self.names:
+            return pd.DataFrame(
+                self.values, index=self.index, columns=self.names, copy=False
+            )
+        return pd.DataFrame({name: self[name] for name in names})
+
+
+def _sorted(
+    dates: np.ndarray, values: np.ndarray
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Ordena por fecha y deja el ultimo dato de cada fecha repetida
+    """
+    if len(dates) > 1 and not (dates[1:] > dates[:-1]).all():
+        order: np.ndarray = np.argsort(dates, kind="stable")
+        dates, values = dates[order], values[order]
+        last: np.ndarray = np.append(dates[1:] != dates[:-1], True)
+        dates, values = dates[last], values[last]
+    return dates, values.astype(np.float64)
+
+
+def _ffill(values: np.ndarray) -> np.ndarray:
+    """
+    Forward fill vectorizado por columna
+    """
+    rows: np.ndarray = np.arange(len(values))[:, None]
+    last: np.ndarray = np.where(np.isnan(values), 0, rows)
+    np.maximum.accumulate(last, axis=0, out=last)
+    return np.asfortranarray(np.take_along_axis(values, last, axis=0))
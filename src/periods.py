@@ -0,0 +1,195 @@
+import numpy as np
+import pandas as pd
+
+from typing import Sequence
+
+from src.panel import Panel
+
+
+# Entidades con un unico titular a la vez: presidente,
+# ministro de economia y presidente del BCRA
+OFFICES: tuple[str, ...] = ("pres", "econ", "bcra")
+
+
+def periods(
+    milestones: pd.DataFrame, entities: Sequence[str] = OFFICES
+) -> pd.DataFrame:
+    """
+    Tabla de periodos a partir de los eventos: cada evento de una
+    entidad abre un periodo que dura hasta el siguiente evento de
+    la misma entidad (end NaT si sigue vigente)
+
+    Parameters
+    ----------
+    milestones: DataFrame
+        Endpoint 'milestones', columnas 'date', 'e' (nombre)
+        y 't' (entidad)
+    entities: lista de string (Default OFFICES)
+        Entidades a incluir
+
+    Return
+    ------
+    DataFrame con columnas entity, name, start y end,
+    ordenado por entidad y fecha
+
+    Example
+    -------
+    >>> periods(data.milestones, ["pres"])
+      entity                        name      start        end
+    0   pres  Eduardo Duhalde (interino) 2002-01-02 2003-05-25
+    1   pres             Nestor Kirchner 2003-05-25 2007-12-10
+    ...
+    """
+    mask: np.ndarray = milestones["t"].isin(entities).to_numpy()
+    entity: np.ndarray = milestones["t"].to_numpy()[mask].astype(str)
+    name: np.ndarray = milestones["e"].to_numpy()[mask].astype(str)
+    start: np.ndarray = milestones["date"].to_numpy()[mask]
+
+    # Orden por entidad y fecha, el fin es el inicio siguiente
+    # mientras la entidad no cambie
+    order: np.ndarray = np.lexsort((start, entity))
+    entity, name, start = entity[order], name[order], start[order]
+    end: np.ndarray = np.empty_like(start)
+    end[:-1] = start[1:]
+    last: np.ndarray = np.ones(len(entity), dtype=bool)
+    last[:-1] = entity[1:] != entity[:-1]
+    end[last] = np.datetime64("NaT")
+
+    return pd.DataFrame(
+        {"entity": entity, "name": name, "start": start, "end": end}
+    )
+
+
+def assign(dates: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    """
+    Posicion del periodo vigente en cada fecha, -1 antes del
+    primero. starts son los inicios ordenados de una sola entidad.
+    Una sola busqueda binaria vectorizada, sin merge
+
+    Example
+    -------
+    >>> pres = periods(data.milestones, ["pres"])
+    >>> assign(data.usd.date.values, pres.start.values)
+    array([ 0,  0,  0, ..., 7,  7,  7])
+    """
+    return np.searchsorted(starts, dates, side="right") - 1
+
+
+def join(
+    quotes: pd.DataFrame,
+    milestones: pd.DataFrame,
+    entities: Sequence[str] = OFFICES,
+) -> pd.DataFrame:
+    """
+    Agrega a quotes una columna por entidad con el nombre del
+    titular vigente en cada fecha (categorica, NaN antes del
+    primer periodo). quotes debe tener la columna 'date'
+
+    Example
+    -------
+    >>> join(data.usd, data.milestones)
+                date        v              pres              econ  ...
+    0     2002-03-04     2.12   Eduardo Duhalde  Jorge Remes Lenicov
+    ...
+    """
+    table: pd.DataFrame = periods(milestones, entities)
+    dates: np.ndarray = quotes["date"].to_numpy()
+    out: pd.DataFrame = quotes.copy()
+
+    for entity in entities:
+        rows: pd.DataFrame = table[table["entity"] == entity]
+        codes, names = pd.factorize(rows["name"])
+        position: np.ndarray = assign(dates, rows["start"].to_numpy())
+        # Sin eventos de la entidad ninguna fecha tiene titular
+        current: np.ndarray = (
+            np.where(position >= 0, codes[position], -1)
+            if len(codes)
+            else np.full(len(dates), -1)
+        )
+        out[entity] = pd.Categorical.from_codes(current, names)
+    return out
+
+
+def stats(
+    usd: pd.DataFrame,
+    usd_of: pd.DataFrame,
+    milestones: pd.DataFrame,
+    entity: str = "pres",
+) -> pd.DataFrame:
+    """
+    Estadisticas de cada periodo de la entidad sobre las fechas
+    con cotizacion del blue y del oficial
+
+    Return
+    ------
+    DataFrame por periodo (solo los que tienen cotizaciones):
+    name, start, end, quotes (cantidad de dias),
+    brecha (promedio de blue / oficial - 1, en %),
+    volatility_blue y volatility_oficial (desvio de los
+    log retornos diarios), devaluation_blue y
+    devaluation_oficial (variacion punta a punta, en %)
+
+    Example
+    -------
+    >>> stats(data.usd, data.usd_of, data.milestones, "econ")
+                      name      start        end  quotes  brecha  ...
+    0  Jorge Remes Lenicov 2002-01-03 2002-04-26      36   10.84  ...
+    ...
+    """
+    table: pd.DataFrame = periods(milestones, [entity]).reset_index(
+        drop=True
+    )
+    dolars: pd.DataFrame = Panel({"usd": usd, "usd_of": usd_of}).frame()
+    position: np.ndarray = assign(
+        dolars.index.values, table["start"].to_numpy()
+    )
+
+    # Las fechas estan ordenadas: cada periodo es un tramo contiguo
+    valid: np.ndarray = position >= 0
+    position = position[valid]
+    blue: np.ndarray = dolars["usd"].to_numpy()[valid]
+    oficial: np.ndarray = dolars["usd_of"].to_numpy()[valid]
+
+    starts: np.ndarray = np.flatnonzero(
+        np.r_[True, position[1:] != position[:-1]]
+    )[: len(position)]
+    ends: np.ndarray = np.r_[starts[1:], len(position)][: len(starts)]
+    counts: np.ndarray = ends - starts
+
+    out: pd.DataFrame = table.iloc[position[starts]].drop(columns="entity")
+    if not len(starts):
+        # reduceat no acepta tramos vacios
+        columns: list[str] = ["quotes", "brecha"] + [
+            f"{stat}_{name}"
+            for name in ("blue", "oficial")
+            for stat in ("volatility", "devaluation")
+        ]
+        return out.reindex(columns=[*out.columns, *columns])
+
+    out["quotes"] = counts
+    out["brecha"] = (
+        np.add.reduceat((blue / oficial - 1) * 100, starts) / counts
+    )
+    for name, values in (("blue", blue), ("oficial", oficial)):
+        out[f"volatility_{name}"] = _std(np.diff(np.log(values)), starts)
+        out[f"devaluation_{name}"] = (
+            values[ends - 1] / values[starts] - 1
+        ) * 100
+    return out.reset_index(drop=True)
+
+
+def _std(returns: np.ndarray, starts: np.ndarray) -> np.ndarray:
+    # Desvio (ddof=1) de los retornos por tramo. Cada retorno cuenta
+    # en el tramo del registro en el que termina, salvo el primero
+    # de cada tramo, que viene del periodo anterior
+    returns = np.r_[np.nan, returns]
+    returns[starts] = np.nan
+    valid: np.ndarray = ~np.isnan(returns)
+    values: np.ndarray = np.where(valid, returns, 0.0)
+
+    n: np.ndarray = np.add.reduceat(valid.astype(np.int64), starts)
+    total: np.ndarray = np.add.reduceat(values, starts)
+    squares: np.ndarray = np.add.reduceat(values**2, starts)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        var: np.ndarray = (squares - total**2 / n) / (n - 1)
+    return np.sqrt(np.where(n > 1, np.maximum(var, 0.0), np.nan))
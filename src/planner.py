@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Iterable, Optional
+
+from src import trace
+from src.dtypes import Endpoints
+
+
+@dataclass(slots=True, frozen=True)
+class Task:
+    """
+    Nodo del grafo de tareas del reporte
+
+    Attributes
+    ----------
+    name: string
+        Nombre con el que se pide desde la linea de comandos
+    func: callable
+        Se llama como func(data, *resultados de deps)
+    points: tupla de Endpoints
+        Endpoints que la tarea lee de data
+    deps: tupla de strings
+        Tareas cuyos resultados necesita
+    threadsafe: bool (Default True)
+        False para tareas que usan estado global (pyplot),
+        esas corren en el hilo principal
+    """
+
+    name: str
+    func: Callable[..., Any]
+    points: tuple[Endpoints, ...] = ()
+    deps: tuple[str, ...] = ()
+    threadsafe: bool = True
+
+
+class Planner:
+    """
+    Arma el grafo de dependencias de las tareas pedidas, consulta
+    en un solo batch concurrente los endpoints minimos y ejecuta
+    en paralelo las tareas independientes
+
+    Example
+    -------
+    >>> planner = Planner(TASKS)
+    >>> planner.plan('c', 'd')
+    [['year'], ['c', 'd']]
+    >>> planner.points('c', 'd')
+    ('var_usd_vs_usd_of',)
+    >>> planner.run('c', 'd', data=Data())
+    {'year': Window(...), 'c': (...), 'd': ...}
+    """
+
+    def __init__(self, tasks: Iterable[Task]):
+        self.tasks: dict[str, Task] = {t.name: t for t in tasks}
+
+    def closure(self, *targets: str) -> list[str]:
+        """
+        Tareas pedidas mas todas sus dependencias
+        """
+        seen: dict[str, None] = {}
+
+        def visit(name: str, path: tuple[str, ...]) -> None:
+            if name not in self.tasks:
+                raise KeyError(
+                    f"Tarea desconocida '{name}', opciones: {list(self.tasks)}"
+                )
+            if name in path:
+                raise ValueError(f"Dependencia circular: {path + (name,)}")
+            for dep in self.tasks[name].deps:
+                visit(dep, path + (name,))
+            seen.setdefault(name)
+
+        for target in targets:
+            visit(target, ())
+        return list(seen)
+
+    def plan(self, *targets: str) -> list[list[str]]:
+        """
+        Tareas agrupadas en olas: cada ola depende
+        solo de las anteriores y se ejecuta en paralelo
+        """
+        level: dict[str, int] = {}
+        for name in self.closure(*targets):
+            deps: tuple[str, ...] = self.tasks[name].deps
+            level[name] = 1 + max((level[d] for d in deps), default=-1)
+
+        waves: list[list[str]] = [[] for _ in range(max(level.values()) + 1)]
+        for name, i in level.items():
+            waves[i].append(name)
+        return waves
+
+    def points(self, *targets: str) -> tuple[Endpoints, ...]:
+        """
+        Endpoints minimos para ejecutar las tareas pedidas
+        """
+        points: dict[Endpoints, None] = {}
+        for name in self.closure(*targets):
+            points.update(dict.fromkeys(self.tasks[name].points))
+        return tuple(points)
+
+    def run(
+        self, *targets: str, data: dict, workers: Optional[int] = None
+    ) -> dict[str, Any]:
+        """
+        Ejecuta las tareas pedidas y sus dependencias
+
+        Parameters
+        ----------
+        *targets: strings
+            Nombres de las tareas
+        data: Data
+            Contenedor de endpoints, se le piden en un solo
+            batch los que falten
+        workers: int Opcional
+            Hilos del pool, por defecto el de ThreadPoolExecutor
+
+        Return
+        ------
+        Diccionario con el resultado de cada tarea ejecutada
+        """
+        waves: list[list[str]] = self.plan(*targets)
+        data.call_api(*self.points(*targets))
+
+        results: dict[str, Any] = {}
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            for wave in waves:
+                futures: dict[str, Future] = {}
+
+                for name in wave:
+                    task: Task = self.tasks[name]
+                    if task.threadsafe:
+                        futures[name] = pool.submit(
+                            self._call, task, data, results
+                        )
+
+                for name in wave:
+                    task = self.tasks[name]
+                    if not task.threadsafe:
+                        results[name] = self._call(task, data, results)
+
+                for name, future in futures.items():
+                    results[name] = future.result()
+
+        return results
+
+    @staticmethod
+    def _call(task: Task, data: dict, results: dict[str, Any]) -> Any:
+        with trace.span("task", task.name):
+            return task.func(data, *[results[d] for d in task.deps])
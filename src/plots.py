@@ -0,0 +1,252 @@
+from __future__ import annotations
+
+import inspect
+import time
+
+import numpy as np
+
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Optional, Sequence
+
+from src import trace
+from src.cache import PlotCache, fingerprint
+
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
+
+@dataclass(slots=True, frozen=True)
+class PlotJob:
+    """
+    Figura a renderizar: funcion de dibujo y sus datos ya calculados.
+    Todo es picklable para poder dibujarla en otro proceso
+
+    Attributes
+    ----------
+    draw: callable
+        Funcion de modulo que se llama como draw(fig, **kwargs)
+    path: string
+        Archivo donde se guarda la imagen
+    kwargs: dict
+        Arrays y parametros del dibujo
+    """
+
+    draw: Callable[..., None]
+    path: str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+
+    def key(self) -> str:
+        """
+        Fingerprint de los datos, los parametros y el codigo de dibujo.
+        No incluye el path, la misma figura sirve para cualquier destino
+        """
+        return fingerprint(
+            self.draw.__module__,
+            self.draw.__qualname__,
+            _source(self.draw),
+            self.kwargs,
+        )
+
+
+def _source(draw: Callable[..., None]) -> str:
+    # El bytecode no cambia si solo cambia una constante (un color,
+    # un titulo), el fuente si. Sin fuente disponible se usan el
+    # bytecode y las constantes, salvo los code objects anidados
+    # cuyo repr incluye la direccion de memoria
+    try:
+        return inspect.getsource(draw)
+    except (OSError, TypeError):
+        code = draw.__code__
+        consts = [c for c in code.co_consts if not inspect.iscode(c)]
+        return repr((code.co_code, consts))
+
+
+def render(
+    jobs: Sequence[PlotJob],
+    workers: Optional[int] = None,
+    cache: Optional[PlotCache] = None,
+) -> list:
+    """
+    Renderiza las figuras en paralelo en un pool de procesos
+    con el backend Agg, cada figura en su propio proceso
+
+    Parameters
+    ----------
+    jobs: lista de PlotJob
+    workers: int Opcional
+        Procesos del pool, por defecto uno por figura
+    cache: PlotCache Opcional
+        Las figuras cuyo fingerprint ya esta en el cache no se
+        vuelven a dibujar, se reutiliza la imagen guardada
+
+    Return
+    ------
+    Lista con los paths guardados, en el orden de jobs
+    """
+    keys: list[str] = [job.key() for job in jobs] if cache else []
+    pending: list[PlotJob] = [
+        job
+        for i, job in enumerate(jobs)
+        if not (cache and cache.restore(keys[i], job.path))
+    ]
+
+    if len(pending) <= 1:
+        timings: list[tuple[str, float]] = [_save(job) for job in pending]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers or len(pending), initializer=_agg
+        ) as pool:
+            timings = list(pool.map(_save, pending))
+
+    # Medido en el proceso hijo, se publica desde este
+    for path, seconds in timings:
+        trace.emit("plot", path, seconds)
+
+    if cache:
+        drawn: set[str] = {path for path, _ in timings}
+        for key, job in zip(keys, jobs):
+            if job.path in drawn:
+                cache.store(key, job.path)
+
+    return [job.path for job in jobs]
+
+
+def show(job: PlotJob) -> None:
+    """
+    Dibuja la figura con pyplot y la muestra, equivalente a plt.show()
+    """
+    import matplotlib.pyplot as plt
+
+    job.draw(plt.figure(), **job.kwargs)
+    plt.show()
+    plt.close()
+
+
+def _agg() -> None:
+    import matplotlib
+
+    matplotlib.use("Agg")
+
+
+def _save(job: PlotJob) -> tuple[str, float]:
+    # Figure sin pyplot: no hay estado global, sirve en hilos y procesos
+    from matplotlib.figure import Figure
+
+    start: float = time.perf_counter()
+    fig = Figure()
+    job.draw(fig, **job.kwargs)
+
+    fig.savefig(job.path)
+    return job.path, time.perf_counter() - start
+
+
+def draw_regression(
+    fig: Figure,
+    dates: np.ndarray,
+    y: np.ndarray,
+    x_train: np.ndarray,
+    y_train: np.ndarray,
+    x_test: np.ndarray,
+    y_test: np.ndarray,
+) -> None:
+    """
+    Precio en logaritmo y la recta ajustada sobre train y test
+    """
+    ax1 = fig.subplots()
+    ax1.plot(dates, y, color="grey")
+
+    ax2 = ax1.twiny()
+    ax2.plot(
+        x_train,
+        y_train,
+        color="black",
+        linestyle="--",
+        label="Train",
+        alpha=0.5,
+    )
+    ax2.plot(x_test, y_test, color="black", label="Test", alpha=0.5)
+
+    ax1.set_yticks([])
+    ax1.set_xticks([])
+    ax2.set_yticks([])
+    ax2.set_xticks([])
+
+    ax2.legend(loc="upper left")
+
+
+def draw_events(
+    fig: Figure,
+    dates: np.ndarray,
+    blue: np.ndarray,
+    oficial: np.ndarray,
+    spans: dict[str, tuple[np.ndarray, np.ndarray]],
+    colors: dict[str, str],
+    pres: np.ndarray,
+    ticks: np.ndarray,
+    labels: Sequence[str],
+) -> None:
+    """
+    Dolar mensual sobre los periodos de cada entidad. Cada entidad
+    se sombrea con una sola coleccion de rectangulos en coordenadas
+    (dato, eje), asi el costo no crece con la cantidad de eventos.
+    spans, pres y ticks van en dias desde 1970-01-01
+    """
+    from matplotlib.collections import LineCollection, PatchCollection
+    from matplotlib.patches import Rectangle
+    from matplotlib.ticker import ScalarFormatter
+
+    ax1 = fig.subplots()
+    transform = ax1.get_xaxis_transform()
+
+    for entity, (start, width) in spans.items():
+        ax1.add_collection(
+            PatchCollection(
+                [Rectangle((x, 0), w, 1) for x, w in zip(start, width)],
+                facecolor=colors[entity],
+                edgecolor=colors[entity],
+                alpha=0.5,
+                transform=transform,
+            ),
+            autolim=False,
+        )
+    ax1.add_collection(
+        LineCollection(
+            [((x, 0), (x, 1)) for x in pres],
+            color="teal",
+            linestyle="--",
+            transform=transform,
+        ),
+        autolim=False,
+    )
+
+    # Sin autolim las colecciones no tocan el eje y (compartido con
+    # el dolar en escala log), el eje x se ajusta a mano con margen
+    # (dias desde 1970-01-01, las mismas unidades que las fechas)
+    days: np.ndarray = dates.astype("datetime64[D]").astype(np.float64)
+    bounds: list[np.ndarray] = [days, pres] + [
+        np.concatenate([s, s + w]) for s, w in spans.values()
+    ]
+    edges: np.ndarray = np.concatenate(bounds)
+    if len(edges):
+        lo, hi = edges.min(), edges.max()
+        margin: float = (hi - lo) * ax1.margins()[0]
+        ax1.set_xlim(lo - margin, hi + margin)
+
+    ax2 = ax1.twiny()
+
+    ax2.plot(dates, blue, color="black")
+    ax2.plot(dates, oficial, color="grey")
+    ax2.set_xlim(ax1.get_xlim())
+
+    # Config
+    ax1.set_xticks(ticks)
+    ax1.set_xticklabels(labels)
+    ax2.set_yscale("log")
+    ax2.set_yticks([5, 10, 20, 40, 80, 160, 300])
+    ax2.get_yaxis().set_major_formatter(ScalarFormatter())
+
+    ax2.legend(
+        ["Dolar Blue", "Dolar Oficial"], loc="lower right", frameon=True
+    )
+    ax2.set_xlabel("Dolar vs Eventos politicos")
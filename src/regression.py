@@ -2,19 +2,378 @@ import pandas as pd
 import numpy as np
 import datetime as dt
 
-import matplotlib.pyplot as plt
+from collections import OrderedDict
+from dataclasses import dataclass
+from dateutil.relativedelta import relativedelta
+from typing import Optional, Sequence
 
-from sklearn.linear_model import LinearRegression
-from sklearn.model_selection import train_test_split
-from sklearn.metrics import mean_squared_error
+from src import trace
+from src.cache import fingerprint
+from src.dtypes import DateLike
+from src.panel import Panel
+from src.plots import PlotJob, draw_regression, render, show
+from src.series import CompactSeries
 
-from dateutil.relativedelta import relativedelta
-from typing import Optional
+
+# dt.date(1970, 1, 1).toordinal()
+ORDINAL_EPOCH: int = 719163
+
+_MODELS: OrderedDict[str, "LogLinearModel"] = OrderedDict()
+_MAX_MODELS: int = 128
+
+
+@dataclass(slots=True, frozen=True)
+class LogLinearModel:
+    """
+    Recta log(v) = intercept + slope * ordinal(date)
+    ajustada por minimos cuadrados
+
+    Attributes
+    ----------
+    slope: float
+        Crecimiento diario del logaritmo del precio
+    intercept: float
+        Ordenada al origen
+    n: int
+        Cantidad de observaciones del ajuste
+    """
+
+    slope: float
+    intercept: float
+    n: int
+
+    def predict_log(self, x: np.ndarray) -> np.ndarray:
+        """
+        Logaritmo del precio para ordinales x
+        """
+        return self.intercept + self.slope * x
+
+    def predict(
+        self, months: int | Sequence[int], asof: Optional[DateLike] = None
+    ) -> np.ndarray:
+        """
+        Precio estimado a cada horizonte en meses desde asof
+        (por defecto hoy), en una sola prediccion vectorizada
+
+        Example
+        -------
+        >>> model = fit(data.usd)
+        >>> model.predict([3, 6, 12])
+        array([340.12, 377.45, 464.9 ])
+        """
+        return np.exp(self.predict_log(_horizons(months, asof)))
+
+
+@dataclass(slots=True, frozen=True)
+class BatchFit:
+    """
+    Resultado de fit_many, un elemento por serie en cada array
+
+    Attributes
+    ----------
+    names: tuple
+        Nombre de cada serie
+    slope: ndarray
+    intercept: ndarray
+    r2: ndarray
+        Coeficiente de determinacion de cada ajuste
+    n: ndarray
+        Observaciones validas (precio > 0) de cada serie
+    """
+
+    names: tuple[str, ...]
+    slope: np.ndarray
+    intercept: np.ndarray
+    r2: np.ndarray
+    n: np.ndarray
+
+    def forecast(
+        self, months: int | Sequence[int], asof: Optional[DateLike] = None
+    ) -> np.ndarray:
+        """
+        Precios estimados, shape (series, horizontes)
+        """
+        x: np.ndarray = _horizons(months, asof)
+        return np.exp(self.intercept[:, None] + self.slope[:, None] * x)
+
+    def model(self, name: str) -> LogLinearModel:
+        i: int = self.names.index(name)
+        return LogLinearModel(
+            float(self.slope[i]), float(self.intercept[i]), int(self.n[i])
+        )
+
+    def frame(
+        self,
+        months: Sequence[int] = (3, 6, 12),
+        asof: Optional[DateLike] = None,
+    ) -> pd.DataFrame:
+        """
+        Resumen por serie: crecimiento anual, r2 y pronosticos
+
+        Example
+        -------
+        >>> fit_many(data.panel('usd', 'usd_of', how='outer')).frame()
+                growth    r2     n      3      6     12
+        usd       0.21  0.96  5566  340.1  377.4  464.9
+        usd_of    0.18  0.97  5420  140.3  152.8  181.2
+        """
+        forecast: np.ndarray = self.forecast(months, asof)
+        df = pd.DataFrame(
+            {
+                "growth": np.expm1(self.slope * 365.25),
+                "r2": self.r2,
+                "n": self.n,
+            },
+            index=list(self.names),
+        )
+        for j, m in enumerate(months):
+            df[m] = forecast[:, j]
+        return df
+
+
+def _horizons(
+    months: int | Sequence[int], asof: Optional[DateLike] = None
+) -> np.ndarray:
+    """
+    Ordinales de asof (por defecto hoy) mas cada horizonte en meses
+    """
+    base: dt.datetime = (
+        pd.Timestamp(asof).to_pydatetime() if asof else dt.datetime.today()
+    )
+    return np.array(
+        [
+            (base + relativedelta(months=int(m))).toordinal()
+            for m in np.atleast_1d(months)
+        ]
+    )
+
+
+def ordinals(dates: np.ndarray) -> np.ndarray:
+    """
+    Equivalente vectorizado de date.toordinal(). Acepta tambien
+    dias enteros desde 1970-01-01 (CompactSeries.days)
+    """
+    if dates.dtype.kind in "iu":
+        return dates.astype(np.int64) + ORDINAL_EPOCH
+    return dates.astype("datetime64[D]").astype(np.int64) + ORDINAL_EPOCH
+
+
+def lstsq(x: np.ndarray, y: np.ndarray) -> tuple[float, float]:
+    """
+    Solucion cerrada de minimos cuadrados de y = a + b * x,
+    centrada para no perder precision con ordinales grandes
+
+    Return
+    ------
+    (slope, intercept)
+    """
+    x_mean, y_mean = x.mean(), y.mean()
+    dx: np.ndarray = x - x_mean
+    slope: float = float(dx @ (y - y_mean) / (dx @ dx))
+    return slope, float(y_mean - slope * x_mean)
+
+
+def fit(
+    data: pd.DataFrame | CompactSeries, col: str = "v"
+) -> LogLinearModel:
+    """
+    Ajusta la regresion log-lineal de una serie. El modelo queda
+    cacheado por el hash del contenido de la serie, ajustar
+    dos veces la misma data no recalcula nada. Acepta tambien
+    una CompactSeries, sin convertirla a pandas
+    """
+    if isinstance(data, CompactSeries):
+        days, values = data.days, data.values
+    else:
+        days, values = data["date"].values, data[col].values
+    key: str = fingerprint(days, values)
+
+    if key in _MODELS:
+        _MODELS.move_to_end(key)
+        return _MODELS[key]
+
+    with trace.span("regression", "fit") as span:
+        x: np.ndarray = ordinals(days)
+        y: np.ndarray = np.log(values.astype(np.float64))
+        model = LogLinearModel(*lstsq(x, y), n=len(x))
+        span.record(rows=len(x))
+
+    _MODELS[key] = model
+    if len(_MODELS) > _MAX_MODELS:
+        _MODELS.popitem(last=False)
+    return model
+
+
+def fit_many(series: Panel | dict[str, pd.DataFrame]) -> BatchFit:
+    """
+    Ajusta la regresion log-lineal de todas las series de un panel
+    en una sola pasada vectorizada. Cada serie usa solo sus fechas
+    con dato, asi que pueden empezar en fechas distintas o tener huecos
+
+    Parameter
+    ---------
+    series: Panel o dict
+        Panel de Data.panel, o un dict de DataFrames
+        que se alinea con how="outer"
+
+    Example
+    -------
+    >>> batch = fit_many(data.panel('usd', 'usd_of', 'cer', how='outer'))
+    >>> batch.forecast([3, 6, 12])
+    array([[340.1, 377.4, 464.9],
+           [140.3, 152.8, 181.2],
+           [ 95.2, 102.7, 119.6]])
+    """
+    panel: Panel = (
+        series if isinstance(series, Panel) else Panel(series, how="outer")
+    )
+
+    x: np.ndarray = ordinals(panel.index.values).astype(np.float64)[:, None]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        y: np.ndarray = np.log(panel.values)
+    valid: np.ndarray = np.isfinite(y)
+
+    n: np.ndarray = valid.sum(axis=0)
+    y = np.where(valid, y, 0.0)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        x_mean: np.ndarray = (x * valid).sum(axis=0) / n
+        y_mean: np.ndarray = y.sum(axis=0) / n
+
+        # Desvios centrados por serie, cero donde no hay dato
+        dx: np.ndarray = np.where(valid, x - x_mean, 0.0)
+        dy: np.ndarray = np.where(valid, y - y_mean, 0.0)
+
+        sxx: np.ndarray = (dx * dx).sum(axis=0)
+        sxy: np.ndarray = (dx * dy).sum(axis=0)
+        syy: np.ndarray = (dy * dy).sum(axis=0)
+
+        slope: np.ndarray = sxy / sxx
+        r2: np.ndarray = sxy**2 / (sxx * syy)
+
+    return BatchFit(
+        names=tuple(panel.names),
+        slope=slope,
+        intercept=y_mean - slope * x_mean,
+        r2=r2,
+        n=n,
+    )
+
+
+def _split(
+    n: int, test_size: float = 0.25, random_state: int = 50
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Misma particion que sklearn.model_selection.train_test_split
+    para los mismos parametros, sin importar sklearn
+    """
+    n_test: int = int(np.ceil(test_size * n))
+    rng = np.random.RandomState(random_state)
+    permutation: np.ndarray = rng.permutation(n)
+    return permutation[n_test:], permutation[:n_test]
+
+
+def _r2(y: np.ndarray, y_pred: np.ndarray) -> float:
+    return 1 - ((y - y_pred) ** 2).sum() / ((y - y.mean()) ** 2).sum()
+
+
+def _diagnostics(data: pd.DataFrame) -> tuple[np.ndarray, ...]:
+    X: np.ndarray = ordinals(data.date.values)
+    y: np.ndarray = np.log(data.v.values.astype(np.float64))
+    train, test = _split(len(X))
+    return X, y, train, test
+
+
+def plot_job(data: pd.DataFrame, save_plot: Optional[str] = None) -> PlotJob:
+    """
+    Figura de la regresion lista para renderizar con plots.render,
+    se guarda en ./plots/{save_plot}.png
+    """
+    model: LogLinearModel = fit(data)
+    X, y, train, test = _diagnostics(data)
+
+    return PlotJob(
+        draw_regression,
+        f"./plots/{save_plot}.png",
+        dict(
+            dates=data.date.values,
+            y=y,
+            x_train=X[train],
+            y_train=model.predict_log(X[train]),
+            x_test=X[test],
+            y_test=model.predict_log(X[test]),
+        ),
+    )
+
+
+def summary(
+    data: pd.DataFrame, month: int | Sequence[int], scores: bool = True
+) -> dict:
+    """
+    Resultado de la regresion como diccionario serializable a JSON
+
+    Parameters
+    ----------
+    data: DataFrame
+        Serie con columnas 'date' y 'v'
+    month: integer o lista de integers
+        Mes o meses a predecir
+    scores: bool (Default True)
+        Incluir errores y scores sobre train y test
+
+    Example
+    -------
+    >>> summary(data.usd, [3, 6])
+    {'predictions': [{'months': 3, 'value': 340.12}, ...],
+     'train_error': 0.03, 'test_error': 0.03, ...}
+    """
+    months: np.ndarray = np.atleast_1d(month)
+    model: LogLinearModel = fit(data)
+
+    out: dict = {
+        "predictions": [
+            {"months": int(m), "value": float(p)}
+            for m, p in zip(months, model.predict(months))
+        ]
+    }
+    if not scores:
+        return out
+
+    X, y, train, test = _diagnostics(data)
+    y_train_pred = model.predict_log(X[train])
+    y_test_pred = model.predict_log(X[test])
+
+    out["train_error"] = float(np.mean((y[train] - y_train_pred) ** 2))
+    out["test_error"] = float(np.mean((y[test] - y_test_pred) ** 2))
+    out["test_score"] = float(_r2(y[test], y_test_pred))
+    out["train_score"] = float(_r2(y[train], y_train_pred))
+    return out
+
+
+def describe(summary: dict) -> str:
+    """
+    Texto de consola de un summary, con los
+    errores y scores si el summary los incluye
+    """
+    out: str = "\n".join(
+        "Prediccion a %i meses: %.2f" % (p["months"], p["value"])
+        for p in summary["predictions"]
+    )
+
+    if "train_error" not in summary:
+        return out
+    return (
+        "Error en Train: %.2f \n" % summary["train_error"]
+        + "Error en Test: %.2f \n" % summary["test_error"]
+        + "Score test: %.2f \n" % summary["test_score"]
+        + "Score train: %.2f \n\n" % summary["train_score"]
+        + out
+    )
 
 
 def regression(
     data: pd.DataFrame,
-    month: int,
+    month: int | Sequence[int],
     verbose: bool = False,
     plot: bool = False,
     save_plot: Optional[str] = None,
@@ -29,8 +388,9 @@ def regression(
     data: DataFrame
         Data del tipo de dolar al cual
         se le va a hacer la regresion
-    month: integer
-        Mes a predecir
+    month: integer o lista de integers
+        Mes o meses a predecir, el modelo se ajusta una sola vez
+        para todos los horizontes
     verbose: bool (Default False)
         Llamar True si se quiere ver
         los errores y scores del modelo
@@ -45,68 +405,17 @@ def regression(
     return
     ------
     Retorna un string con la informacion del modelo
-    """
-    df = data.copy()
-
-    X = df.date.apply(lambda x: x.toordinal()).values.reshape(-1, 1)
-    y = np.log(df.v.values.reshape(-1, 1))
-
-    X_train, X_test, y_train, y_test = train_test_split(
-        X, y, test_size=0.25, random_state=50
-    )
-
-    model = LinearRegression()
-    model.fit(X, y)
-
-    y_train_pred = model.predict(X_train)
-    y_test_pred = model.predict(X_test)
 
-    pred_date = np.array(
-        (dt.datetime.today() + relativedelta(months=month)).toordinal()
-    ).reshape(1, -1)
-
-    prediction = np.exp(model.predict(pred_date))
-
-    if plot or save_plot:
-        _, ax1 = plt.subplots()
-
-        ax1.plot(df.date, np.log(df.v), color="grey")
+    Example
+    -------
+    >>> print(regression(data.usd, [3, 6, 12]))
+    Prediccion a 3 meses: 340.12
+    Prediccion a 6 meses: 377.45
+    Prediccion a 12 meses: 464.90
+    """
+    if save_plot:
+        render([plot_job(data, save_plot)])
+    elif plot:
+        show(plot_job(data))
 
-        ax2 = ax1.twiny()
-        ax2.plot(
-            X_train,
-            y_train_pred,
-            color="black",
-            linestyle="--",
-            label="Train",
-            alpha=0.5,
-        )
-        ax2.plot(X_test, y_test_pred, color="black", label="Test", alpha=0.5)
-
-        ax1.set_yticks([])
-        ax1.set_xticks([])
-        ax2.set_yticks([])
-        ax2.set_xticks([])
-
-        plt.legend(loc="upper left")
-
-        if save_plot:
-            plt.savefig(f"./plots/{save_plot}.png")
-        elif plot:
-            plt.show()
-        # plt.cla()
-        # plt.clf()
-        plt.close()
-
-    if verbose:
-        return (
-            "Error en Train: %.2f \n"
-            % mean_squared_error(y_train, y_train_pred)
-            + "Error en Test: %.2f \n"
-            % mean_squared_error(y_test, y_test_pred)
-            + "Score test: %.2f \n" % model.score(X_test, y_test)
-            + "Score train: %.2f \n\n" % model.score(X_train, y_train)
-            + "Prediccion a %i meses: %.2f" % (month, prediction)
-        )
-    else:
-        return "Prediccion a %i meses: %.2f" % (month, prediction)
+    return describe(summary(data, month, scores=verbose))
@@ -0,0 +1,274 @@
+import json
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from typing import Any, Callable, Iterable, Literal, Optional
+
+from src.cache import SectionCache, fingerprint
+from src.consignas import a, b, c, d
+from src.docs import STDOUT, doble_template, week_var_template
+from src.periods import stats
+from src.regression import describe, summary
+from src.window import Window
+
+
+Format = Literal["console", "json", "markdown"]
+
+# Toda la data recibida, las secciones reciben la ventana ya aplicada
+_ALL: Window = Window()
+
+TITLES: dict[str, str] = {
+    "a": "Dia con mayor variacion entre dolar blue y dolar oficial",
+    "b": "Top 5 dias con mayor volatilidad, dolar blue y oficial",
+    "c": "Semana con mayor variacion en la brecha",
+    "d": "Dia de la semana con mayor variacion en la brecha",
+    "reg_blue": "Regresion lineal, dolar blue",
+    "reg_oficial": "Regresion lineal, dolar oficial",
+    "periods": "Brecha, volatilidad y devaluacion por presidencia",
+}
+
+# Version del calculo de cada seccion, es parte de la clave de cache:
+# subirla al cambiar la seccion o las funciones que usa
+# (consignas, summary, stats) invalida los resultados guardados
+VERSIONS: dict[str, int] = {
+    "a": 1,
+    "b": 1,
+    "c": 1,
+    "d": 1,
+    "reg_blue": 1,
+    "reg_oficial": 1,
+    "periods": 1,
+}
+
+# Secciones que dependen de la fecha de hoy (predicciones a n meses),
+# su clave incluye el dia
+DATED: frozenset[str] = frozenset({"reg_blue", "reg_oficial"})
+
+# Secciones del layout original (STDOUT), en orden
+LAYOUT: tuple[str, ...] = ("a", "b", "c", "d", "reg_blue", "reg_oficial")
+
+
+# Secciones: funciones puras de sus entradas que retornan
+# valores serializables a JSON
+def section_a(var: pd.DataFrame) -> dict:
+    return {"date": a(var, _ALL)}
+
+
+def section_b(usd: pd.DataFrame, usd_of: pd.DataFrame) -> dict:
+    return {
+        name: [
+            {"date": str(row.date.date()), "volatility": float(row.volatility)}
+            for row in b(df, "v", _ALL).itertuples()
+        ]
+        for name, df in (("usd", usd), ("usd_of", usd_of))
+    }
+
+
+def section_c(var: pd.DataFrame) -> dict:
+    start, end, variation = c(var, _ALL)
+    return {"start": start, "end": end, "variation": _float(variation)}
+
+
+def section_d(var: pd.DataFrame) -> list[dict]:
+    return [
+        {"weekday": day, "v": _float(v)}
+        for day, v in d(var, _ALL)["v"].items()
+    ]
+
+
+def _float(value: Any) -> float:
+    # Un float32 (tasas) pasado directo a float arrastra ruido
+    # (84.11039733886719), se toma su representacion mas corta
+    if isinstance(value, np.float32):
+        return float(str(value))
+    return float(value)
+
+
+def section_regression(data: pd.DataFrame, months: tuple[int, ...]) -> dict:
+    return summary(data, months)
+
+
+def section_periods(
+    usd: pd.DataFrame, usd_of: pd.DataFrame, milestones: pd.DataFrame
+) -> list[dict]:
+    table: pd.DataFrame = stats(usd, usd_of, milestones, "pres")
+    for col in ("start", "end"):
+        table[col] = table[col].dt.strftime("%Y-%m-%d")
+    return json.loads(table.to_json(orient="records", double_precision=15))
+
+
+class Report:
+    """
+    Reporte estructurado: cada seccion se calcula una sola vez y se
+    memoriza por el fingerprint de sus entradas, su version (VERSIONS)
+    y, si depende de la fecha (DATED), el dia. Cuando llega data
+    nueva solo se recalculan las secciones cuyas entradas cambiaron
+
+    Parameters
+    ----------
+    cache: SectionCache Opcional
+        Cache en disco de las secciones, sin cache
+        se memoriza solo en esta instancia
+
+    Example
+    -------
+    >>> report = Report(SectionCache())
+    >>> report.section("c", section_c, year.slice(data.var_usd_vs_usd_of))
+    {'start': '2022-07-18', 'end': '2022-07-22', 'variation': 34.72}
+    >>> print(report.render("json"))
+    {"c": {"start": "2022-07-18", ...}}
+    """
+
+    def __init__(self, cache: Optional[SectionCache] = None):
+        self.cache: Optional[SectionCache] = cache
+        self.sections: dict[str, Any] = {}
+        self._memory: dict[str, Any] = {}
+
+    def section(
+        self, name: str, compute: Callable[..., Any], *inputs: Any
+    ) -> Any:
+        """
+        Valor de la seccion, calculado solo si no hay
+        uno memorizado para las mismas entradas
+        """
+        asof: Optional[str] = (
+            dt.date.today().isoformat() if name in DATED else None
+        )
+        key: str = fingerprint(name, VERSIONS.get(name, 0), asof, *inputs)
+
+        value: Optional[Any] = self._memory.get(key)
+        if value is None and self.cache:
+            value = self.cache.get(key)
+        if value is None:
+            value = compute(*inputs)
+            if self.cache:
+                self.cache.put(key, value)
+
+        self._memory[key] = self.sections[name] = value
+        return value
+
+    def render(
+        self, fmt: Format = "console", names: Optional[Iterable[str]] = None
+    ) -> str:
+        """
+        Reporte en el formato pedido, names elige las secciones
+        (por defecto todas las calculadas, en orden de calculo)
+        """
+        names = [n for n in (names or self.sections) if n in self.sections]
+
+        if fmt == "json":
+            return json.dumps(
+                {n: self.sections[n] for n in names},
+                ensure_ascii=False,
+                indent=2,
+            )
+        if fmt == "markdown":
+            return "\n\n".join(
+                f"## {TITLES.get(n, n)}\n\n{_markdown(n, self.sections[n])}"
+                for n in names
+            )
+        if fmt == "console":
+            # Layout original cuando estan todas las secciones
+            if tuple(names) == LAYOUT:
+                return STDOUT.format(
+                    *[_console(n, self.sections[n]) for n in names]
+                )
+            return "\n\n".join(_console(n, self.sections[n]) for n in names)
+
+        raise ValueError(f"Formato desconocido '{fmt}'")
+
+
+def _frames(name: str, value: Any) -> list[pd.DataFrame]:
+    # Tablas de la seccion con los mismos dtypes que las consignas
+    if name == "b":
+        return [
+            pd.DataFrame(value[s]).astype({"date": "datetime64[ns]"})
+            for s in ("usd", "usd_of")
+        ]
+    if name == "periods":
+        return [pd.DataFrame(value)]
+    if name == "d":
+        return [
+            pd.DataFrame(
+                {"v": [r["v"] for r in value]},
+                index=pd.Index([r["weekday"] for r in value], name="date"),
+            )
+        ]
+    return []
+
+
+def _console(name: str, value: Any) -> str:
+    if name == "a":
+        return value["date"]
+    if name == "b":
+        usd, usd_of = _frames(name, value)
+        return doble_template.format(
+            *[
+                f"{i}          {j}"
+                for i, j in zip(
+                    usd.to_string().split("\n"),
+                    usd_of.to_string().split("\n"),
+                )
+            ]
+        )
+    if name == "c":
+        return week_var_template % (
+            value["start"],
+            value["end"],
+            value["variation"],
+        )
+    if name == "d":
+        return _frames(name, value)[0].to_string()
+    if name == "periods":
+        return _frames(name, value)[0].to_string(index=False)
+    return describe(value)
+
+
+def _markdown(name: str, value: Any) -> str:
+    if name == "a":
+        return value["date"]
+    if name == "b":
+        usd, usd_of = _frames(name, value)
+        return "\n\n".join(
+            f"**{title}**\n\n{_table(df)}"
+            for title, df in (("Dolar blue", usd), ("Dolar oficial", usd_of))
+        )
+    if name == "c":
+        return "Desde %s hasta %s, con una variacion de %.2f%%" % (
+            value["start"],
+            value["end"],
+            value["variation"],
+        )
+    if name == "d":
+        return _table(
+            _frames(name, value)[0].rename_axis("weekday").reset_index()
+        )
+    if name == "periods":
+        return _table(_frames(name, value)[0])
+
+    predictions = pd.DataFrame(value["predictions"])
+    scores: str = "\n".join(
+        f"- {key}: {value[key]:.4f}"
+        for key in ("train_error", "test_error", "train_score", "test_score")
+        if key in value
+    )
+    return f"{scores}\n\n{_table(predictions)}".strip()
+
+
+def _table(df: pd.DataFrame) -> str:
+    # Tabla markdown sin depender de tabulate
+    rows: list[list[str]] = [[str(col) for col in df.columns]]
+    rows.append(["---"] * len(df.columns))
+    for record in df.itertuples(index=False):
+        rows.append([_cell(x) for x in record])
+    return "\n".join("| " + " | ".join(r) + " |" for r in rows)
+
+
+def _cell(x: Any) -> str:
+    if isinstance(x, pd.Timestamp):
+        return x.strftime("%Y-%m-%d")
+    if isinstance(x, float):
+        return f"{x:.6g}"
+    return str(x)
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from dataclasses import dataclass
+
+from src.dtypes import Endpoints
+
+
+@dataclass(slots=True, frozen=True)
+class Schema:
+    """
+    Tipos de las columnas de un endpoint
+
+    Attributes
+    ----------
+    value: string (Default "float64")
+        dtype de la columna 'v'
+    categories: tuple
+        Columnas de texto que se guardan como categoricas
+    resolution: string (Default "D")
+        Unidad a la que se truncan las fechas (datetime64[unit])
+    record: bool (Default False)
+        True si el endpoint no es una serie {"d": ..., "v": ...}
+    """
+
+    value: str = "float64"
+    categories: tuple[str, ...] = ()
+    resolution: str = "D"
+    record: bool = False
+
+
+PRICE: Schema = Schema()
+RATE: Schema = Schema(value="float32")
+
+SCHEMAS: dict[Endpoints, Schema] = {
+    "milestones": Schema(categories=("e", "t"), record=True),
+    "base": PRICE,
+    "base_usd": PRICE,
+    "base_usd_of": PRICE,
+    "reservas": PRICE,
+    "base_div_res": PRICE,
+    "usd": PRICE,
+    "usd_of": PRICE,
+    "usd_of_minorista": PRICE,
+    # Tasa, pero las consignas c y d reportan promedios y sumas de
+    # la brecha con 6 decimales que float32 no alcanza a sostener
+    "var_usd_vs_usd_of": PRICE,
+    "circulacion_monetaria": PRICE,
+    "billetes_y_monedas": PRICE,
+    "efectivo_en_ent_fin": PRICE,
+    "depositos_cuenta_ent_fin": PRICE,
+    "depositos": PRICE,
+    "cuentas_corrientes": PRICE,
+    "cajas_ahorro": PRICE,
+    "plazo_fijo": PRICE,
+    "tasa_depositos_30_dias": RATE,
+    "prestamos": PRICE,
+    "tasa_prestamos_personales": RATE,
+    "tasa_adelantos_cuenta_corriente": RATE,
+    "porc_prestamos_vs_depositos": RATE,
+    "lebac": PRICE,
+    "leliq": PRICE,
+    "lebac_usd": PRICE,
+    "leliq_usd": PRICE,
+    "leliq_usd_of": PRICE,
+    "tasa_leliq": RATE,
+    "m2_privado_variacion_mensual": RATE,
+    "cer": PRICE,
+    "uva": PRICE,
+    "uvi": PRICE,
+    "tasa_badlar": RATE,
+    "tasa_baibar": RATE,
+    "tasa_tm20": RATE,
+    "tasa_pase_activas_1_dia": RATE,
+    "tasa_pase_pasivas_1_dia": RATE,
+    "inflacion_mensual_oficial": RATE,
+    "inflacion_interanual_oficial": RATE,
+    "inflacion_esperada_oficial": RATE,
+    "dif_inflacion_esperada_vs_interanual": RATE,
+    "var_base_monetaria_interanual": RATE,
+    "var_usd_interanual": RATE,
+    "var_usd_oficial_interanual": RATE,
+    "var_merval_interanual": RATE,
+    "var_usd_anual": RATE,
+    "var_usd_of_anual": RATE,
+    "var_merval_anual": RATE,
+    "merval": PRICE,
+    "merval_usd": PRICE,
+}
+
+
+# Series de precios y montos, candidatas a regresion log-lineal
+PRICES: tuple[Endpoints, ...] = tuple(
+    p for p, schema in SCHEMAS.items() if schema is PRICE
+)
+
+
+def schema_of(point: Endpoints | None) -> Schema:
+    """
+    Schema registrado para el endpoint, PRICE si no esta registrado
+    """
+    return SCHEMAS.get(point, PRICE)
+
+
+def normalize_dates(values: np.ndarray, resolution: str = "D") -> np.ndarray:
+    """
+    Trunca las fechas a la resolucion pedida de forma vectorizada,
+    sin pasar por objetos datetime.date de python
+
+    Example
+    -------
+    >>> normalize_dates(np.array(["2022-08-03T15:30"], dtype="datetime64"))
+    array(['2022-08-03T00:00:00.000000000'], dtype='datetime64[ns]')
+    """
+    if values.dtype.kind != "M":
+        values = pd.to_datetime(values).values
+    return values.astype(f"datetime64[{resolution}]").astype("datetime64[ns]")
+
+
+def apply_schema(df: pd.DataFrame, point: Endpoints | None) -> pd.DataFrame:
+    """
+    Normaliza las fechas y castea las columnas segun el schema
+    del endpoint. Modifica y retorna el mismo dataframe
+    """
+    schema: Schema = schema_of(point)
+
+    if "date" in df:
+        df["date"] = normalize_dates(df["date"].values, schema.resolution)
+    if "v" in df:
+        df["v"] = df["v"].astype(schema.value)
+    for col in schema.categories:
+        if col in df:
+            df[col] = df[col].astype("category")
+    return df
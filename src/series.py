@@ -0,0 +1,208 @@
+import numpy as np
+import pandas as pd
+
+from typing import TYPE_CHECKING, Optional
+
+from src.dtypes import JSON
+from src.stream import WEEKDAYS
+
+if TYPE_CHECKING:
+    from src.window import Window
+
+
+EPOCH: np.datetime64 = np.datetime64("1970-01-01", "D")
+
+
+class CompactSeries:
+    """
+    Serie diaria compacta: dias desde 1970-01-01 en int32 y valores
+    en float32 o float64, sin DataFrame ni indice de pandas.
+    Ocupa 8 (float32) o 12 (float64) bytes por registro, contra
+    16 de un DataFrame con datetime64[ns] y float64
+
+    Parameters
+    ----------
+    days: array de int
+        Dias desde EPOCH, ordenados
+    values: array de float
+        Un valor por dia
+    name: string Opcional
+        Nombre de la serie (endpoint)
+
+    Example
+    -------
+    >>> usd = CompactSeries.from_frame(data.usd, dtype="float32")
+    >>> usd.nbytes
+    44520
+    >>> usd.window(Window.last(days=365)).top_volatility()
+    (array(['2022-07-04', ...], dtype='datetime64[D]'), array([0.0842, ...]))
+    >>> usd.to_frame()
+               date         v
+    0    2000-05-24  1.000500
+    ...
+    """
+
+    __slots__ = ("days", "values", "name")
+
+    def __init__(
+        self,
+        days: np.ndarray,
+        values: np.ndarray,
+        name: Optional[str] = None,
+    ):
+        if len(days) != len(values):
+            raise ValueError("days y values deben tener el mismo largo")
+        self.days: np.ndarray = np.asarray(days, dtype=np.int32)
+        self.values: np.ndarray = np.asarray(values)
+        self.name: Optional[str] = name
+
+    @classmethod
+    def from_dates(
+        cls,
+        dates: np.ndarray,
+        values: np.ndarray,
+        dtype: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> "CompactSeries":
+        days: np.ndarray = (
+            dates.astype("datetime64[D]") - EPOCH
+        ).astype(np.int32)
+        return cls(days, np.asarray(values, dtype=dtype), name)
+
+    @classmethod
+    def from_frame(
+        cls,
+        df: pd.DataFrame,
+        col: str = "v",
+        dtype: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> "CompactSeries":
+        """
+        Desde un DataFrame con columnas 'date' y col,
+        dtype permite bajar los valores a float32
+        """
+        return cls.from_dates(df["date"].values, df[col].values, dtype, name)
+
+    @classmethod
+    def from_columns(
+        cls,
+        data: JSON,
+        dtype: Optional[str] = None,
+        name: Optional[str] = None,
+    ) -> "CompactSeries":
+        """
+        Desde las columnas {"d": ..., "v": ...} de SeriesDecoder,
+        sin pasar por pandas
+        """
+        return cls.from_dates(data["d"], data["v"], dtype, name)
+
+    def to_frame(self, col: str = "v") -> pd.DataFrame:
+        return pd.DataFrame({"date": self.dates, col: self.values})
+
+    @property
+    def dates(self) -> np.ndarray:
+        return (EPOCH + self.days).astype("datetime64[ns]")
+
+    @property
+    def nbytes(self) -> int:
+        return self.days.nbytes + self.values.nbytes
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __repr__(self) -> str:
+        return "CompactSeries(%r, %i registros, %s, %i bytes)" % (
+            self.name,
+            len(self),
+            self.values.dtype,
+            self.nbytes,
+        )
+
+    def astype(self, dtype: str) -> "CompactSeries":
+        return CompactSeries(self.days, self.values.astype(dtype), self.name)
+
+    def slice(self, i: int, j: int) -> "CompactSeries":
+        """
+        Registros [i, j), comparte memoria con esta serie
+        """
+        return CompactSeries(self.days[i:j], self.values[i:j], self.name)
+
+    def window(self, window: "Window") -> "CompactSeries":
+        """
+        Registros dentro de la ventana, sin copiar
+        """
+        return window.slice(self)
+
+    # Analisis directo sobre los arrays
+    def log_returns(self) -> np.ndarray:
+        """
+        log(v / v anterior), NaN en el primer registro
+        """
+        out: np.ndarray = np.empty(len(self), dtype=np.float64)
+        out[:1] = np.nan
+        out[1:] = np.diff(np.log(self.values.astype(np.float64)))
+        return out
+
+    def argmax(self) -> np.datetime64:
+        """
+        Dia con el mayor valor (consigna a)
+        """
+        return EPOCH + self.days[np.nanargmax(self.values)]
+
+    def top_volatility(self, n: int = 5) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Los n dias con mayor |log retorno| (consigna b),
+        retorna (dias, volatilidades) de mayor a menor
+        """
+        volatility: np.ndarray = np.abs(self.log_returns())
+        order: np.ndarray = np.argsort(-volatility, kind="stable")[:n]
+        return EPOCH + self.days[order], volatility[order]
+
+    def weekly_range(self) -> tuple[np.datetime64, np.datetime64, float]:
+        """
+        Semana (lunes a viernes) con mayor diferencia entre
+        maximo y minimo (consigna c)
+        """
+        # 1970-01-01 fue jueves: dia de la semana con lunes = 0
+        weekday: np.ndarray = (self.days + 3) % 7
+        friday: np.ndarray = self.days + (4 - weekday) % 7
+
+        # fmax/fmin ignoran NaN, como resample().max()/.min()
+        starts: np.ndarray = np.flatnonzero(np.r_[True, np.diff(friday) != 0])
+        spread: np.ndarray = np.fmax.reduceat(
+            self.values, starts
+        ) - np.fmin.reduceat(self.values, starts)
+
+        best: int = int(np.argmax(spread))
+        end: np.datetime64 = EPOCH + friday[starts[best]]
+        return end - 4, end, float(spread[best])
+
+    def weekday_mean(self) -> dict[str, float]:
+        """
+        Promedio por dia de la semana, de mayor a menor (consigna d)
+        """
+        valid: np.ndarray = ~np.isnan(self.values)
+        weekday: np.ndarray = (self.days[valid] + 3) % 7
+        total: np.ndarray = np.bincount(
+            weekday, weights=self.values[valid], minlength=7
+        )
+        count: np.ndarray = np.bincount(weekday, minlength=7)
+
+        means: dict[str, float] = {
+            WEEKDAYS[i]: total[i] / count[i] for i in range(7) if count[i]
+        }
+        return dict(sorted(means.items(), key=lambda kv: -kv[1]))
+
+    def monthly_mean(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Promedio mensual, retorna (meses datetime64[M], promedios)
+        """
+        months: np.ndarray = (EPOCH + self.days).astype("datetime64[M]")
+        starts: np.ndarray = np.flatnonzero(
+            np.r_[True, months[1:] != months[:-1]]
+        )
+        total: np.ndarray = np.add.reduceat(
+            self.values.astype(np.float64), starts
+        )
+        return months[starts], total / np.diff(np.r_[starts, len(self)])
+
@@ -0,0 +1,176 @@
+import asyncio
+import copy
+import datetime as dt
+import logging
+
+from aiohttp import web
+from typing import Optional, Sequence
+
+from src.api import API
+from src.cache import SeriesCache
+from src.dataclass import Data
+from src.dtypes import Endpoints
+from src.regression import LogLinearModel, fit
+
+
+logger = logging.getLogger(__name__)
+
+
+class PredictionService:
+    """
+    Calculadora de prediccion del dolar (consigna bonus) como
+    servicio HTTP. Mantiene en memoria las series y los modelos
+    ajustados, y los refresca en segundo plano
+
+    Parameters
+    ----------
+    series: lista de Endpoints (Default ("usd", "usd_of"))
+        Series que se pueden consultar
+    refresh: float (Default 3600)
+        Segundos entre cada refresco de data y modelos
+    cache: SeriesCache Opcional
+        Cache en disco usado al refrescar. Su max_age se acota a
+        la mitad de refresh para que cada refresco consulte el API
+    max_months: int (Default 120)
+        Horizonte maximo aceptado
+
+    Example
+    -------
+    $ python -m src serve --port 8080
+    $ curl 'localhost:8080/predict?series=usd&months=6'
+    {"series": "usd", "months": 6, "prediction": 377.45, ...}
+    """
+
+    def __init__(
+        self,
+        series: Sequence[Endpoints] = ("usd", "usd_of"),
+        refresh: float = 3600.0,
+        cache: Optional[SeriesCache] = None,
+        max_months: int = 120,
+    ):
+        self.series: tuple[Endpoints, ...] = tuple(series)
+        self.refresh: float = refresh
+
+        # Con max_age mayor que refresh el refresco leeria la misma
+        # copia del cache y nunca traeria datos nuevos. Se acota
+        # sobre una copia para no cambiar el cache de quien lo paso
+        max_age = dt.timedelta(seconds=refresh / 2)
+        if cache is not None and cache.max_age > max_age:
+            cache = copy.copy(cache)
+            cache.max_age = max_age
+        self.cache: Optional[SeriesCache] = cache
+        self.max_months: int = max_months
+
+        self.models: dict[Endpoints, LogLinearModel] = {}
+        self.last: dict[Endpoints, dict] = {}
+        self.fitted_at: Optional[dt.datetime] = None
+
+        self._answers: dict[tuple, dict] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    async def refresh_models(self) -> None:
+        """
+        Consulta las series y reajusta los modelos. Los modelos
+        anteriores siguen respondiendo hasta que termina
+        """
+        data = Data(cache=self.cache)
+        await data.acall_api(*self.series)
+
+        models = {s: fit(data[s]) for s in self.series}
+        last = {
+            s: {
+                "date": str(data[s].date.iloc[-1].date()),
+                "value": round(float(data[s].v.iloc[-1]), 4),
+            }
+            for s in self.series
+        }
+
+        self.models, self.last = models, last
+        self.fitted_at = dt.datetime.now()
+        self._answers = {}
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh)
+            try:
+                await self.refresh_models()
+            except Exception:
+                logger.exception("No se pudieron refrescar los modelos")
+
+    def answer(self, series: Endpoints, months: int) -> dict:
+        """
+        Prediccion memorizada por serie, horizonte y dia
+        """
+        key: tuple = (series, months, dt.date.today())
+
+        if key not in self._answers:
+            prediction = self.models[series].predict(months)[0]
+            self._answers[key] = {
+                "series": series,
+                "months": months,
+                "prediction": round(float(prediction), 2),
+                "last": self.last[series],
+                "fitted_at": self.fitted_at.isoformat(timespec="seconds"),
+            }
+        return self._answers[key]
+
+    async def predict(self, request: web.Request) -> web.Response:
+        series: str = request.query.get("series", "usd")
+        months: str = request.query.get("months", "")
+
+        if not self.models:
+            raise web.HTTPServiceUnavailable(text="Modelos no disponibles")
+        if series not in self.models:
+            raise web.HTTPBadRequest(
+                text=f"series debe ser una de {list(self.models)}"
+            )
+        # isdigit acepta superindices como '²' que int no convierte
+        try:
+            horizon: int = int(months)
+        except ValueError:
+            horizon = 0
+        if not 0 < horizon <= self.max_months:
+            raise web.HTTPBadRequest(
+                text=f"months debe ser un entero entre 1 y {self.max_months}"
+            )
+
+        return web.json_response(self.answer(series, horizon))
+
+    async def health(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "series": list(self.models),
+                "fitted_at": self.fitted_at and self.fitted_at.isoformat(),
+            }
+        )
+
+    async def _start(self, app: web.Application) -> None:
+        await self.refresh_models()
+        self._task = asyncio.create_task(self._refresh_loop())
+
+    async def _stop(self, app: web.Application) -> None:
+        if self._task:
+            self._task.cancel()
+
+    def app(self) -> web.Application:
+        app = web.Application()
+        app.router.add_get("/predict", self.predict)
+        app.router.add_get("/health", self.health)
+        app.on_startup.append(self._start)
+        app.on_cleanup.append(self._stop)
+        return app
+
+
+def serve(
+    host: str = "127.0.0.1",
+    port: int = 8080,
+    site: Optional[str] = None,
+    **kwargs,
+) -> None:
+    """
+    Levanta el servicio, site permite apuntar API
+    a otro servidor (por ejemplo uno local de prueba)
+    """
+    if site:
+        API.use(site)
+    web.run_app(PredictionService(**kwargs).app(), host=host, port=port)
@@ -0,0 +1,220 @@
+import os
+import json
+import time
+
+import numpy as np
+import pandas as pd
+
+from pathlib import Path
+from typing import Optional
+
+from src.cache import CACHE_DIR, SeriesCache
+from src.dataclass import Data
+from src.dtypes import Endpoints
+
+
+# Relecturas del manifest si la version leida ya fue borrada
+RETRIES: int = 3
+
+
+class SeriesStore(SeriesCache):
+    """
+    Cache local columnar que se lee con np.memmap: cada endpoint es
+    un directorio con un archivo binario de ancho fijo por columna
+    y un manifest.json. Los DataFrames se arman sobre los arrays
+    mapeados sin copiarlos, asi todos los procesos de la maquina
+    (reporte, servicio, notebooks) comparten una sola copia fisica
+    de la data en el page cache y arrancan sin decodificar nada.
+
+    Se usa igual que SeriesCache (Data(cache=SeriesStore())).
+    Los arrays se mapean copy-on-write: modificar un DataFrame
+    no modifica el archivo ni lo que ven los otros procesos
+
+    Parameters
+    ----------
+    path: Path (Default CACHE_DIR / "store")
+        Directorio del store
+    max_age: timedelta (Default 12 horas)
+        Ventana en la que un endpoint se considera fresco
+
+    Example
+    -------
+    >>> store = SeriesStore()
+    >>> store.dump(Data().call_api('usd', 'usd_of'))
+    >>> data = store.read('usd', 'usd_of')  # en otro proceso
+    >>> data.usd
+               date         v
+    0    2000-05-24    1.0005
+    ...         ...       ...
+
+    Layout
+    ------
+    usd/manifest.json
+    usd/date.<version>.bin    datetime64[ns]
+    usd/v.<version>.bin       float64
+    milestones/e.<version>.bin  codigos de la categoria,
+                                las categorias van en el manifest
+    """
+
+    def __init__(self, path: Path | str = CACHE_DIR / "store", **kwargs):
+        super().__init__(path, **kwargs)
+
+    def path_of(self, point: Endpoints) -> Path:
+        # Frescura, touch y existencia se miden sobre el manifest
+        return self.path / point / "manifest.json"
+
+    def load(self, point: Endpoints) -> Optional[pd.DataFrame]:
+        """
+        DataFrame sobre los archivos mapeados, None si no existe
+        """
+        file = self.path_of(point)
+        for attempt in range(RETRIES):
+            manifest: Optional[dict] = _manifest(file)
+            if manifest is None:
+                return None
+
+            rows: int = manifest["rows"]
+            try:
+                arrays: list[np.ndarray] = [
+                    _map(file.parent / column["file"], column["dtype"], rows)
+                    for column in manifest["columns"]
+                ]
+            except FileNotFoundError:
+                # Entre leer el manifest y mapear hubo dos saves y
+                # _prune borro esta version, se relee el manifest
+                if attempt == RETRIES - 1:
+                    raise
+                continue
+            return decode(manifest["columns"], arrays)
+
+    def save(self, point: Endpoints, df: pd.DataFrame) -> None:
+        """
+        Escribe una version nueva de las columnas y reemplaza el
+        manifest de forma atomica. Los lectores que ya mapearon la
+        version anterior la siguen viendo completa, y los que solo
+        leyeron su manifest la encuentran hasta el proximo save
+        """
+        folder: Path = self.path_of(point).parent
+        folder.mkdir(parents=True, exist_ok=True)
+        version: str = "%x" % time.time_ns()
+
+        columns, arrays = encode(df)
+        for column, values in zip(columns, arrays):
+            column["file"] = f"{column['name']}.{version}.bin"
+            with open(folder / column["file"], "wb") as file:
+                values.tofile(file)
+
+        # La version anterior se conserva hasta el proximo save:
+        # un lector que ya leyo el manifest viejo todavia la mapea
+        keep: set[str] = {c["file"] for c in columns}
+        previous: Optional[dict] = _manifest(self.path_of(point))
+        if previous is not None:
+            keep |= {c["file"] for c in previous["columns"]}
+
+        manifest: dict = {"rows": len(df), "columns": columns}
+        tmp = self.path_of(point).with_suffix(".tmp")
+        tmp.write_text(json.dumps(manifest))
+        os.replace(tmp, self.path_of(point))
+
+        _prune(folder, keep)
+
+    def clear(self, point: Optional[Endpoints] = None) -> None:
+        """
+        Borra un endpoint del store o todo el store
+        """
+        folders = (
+            [self.path_of(point).parent] if point else self.path.glob("*")
+        )
+        for folder in folders:
+            if not folder.is_dir():
+                continue
+            for file in folder.glob("*"):
+                file.unlink(missing_ok=True)
+            if folder.exists():
+                folder.rmdir()
+
+    def dump(self, data: Data) -> None:
+        """
+        Guarda en el store todos los endpoints cargados en data
+        """
+        for point, df in data.items():
+            self.save(point, df)
+
+    def read(self, *points: Endpoints) -> Data:
+        """
+        Data con los endpoints guardados en el store, sin consultar
+        el API. Los endpoints que falten se consultan al accederlos
+        y se agregan al store
+        """
+        content: dict[Endpoints, pd.DataFrame] = {}
+        for point in points:
+            df: Optional[pd.DataFrame] = self.load(point)
+            if df is not None:
+                content[point] = df
+        return Data(content, cache=self)
+
+
+def encode(df: pd.DataFrame) -> tuple[list[dict], list[np.ndarray]]:
+    """
+    Columnas de df como arrays contiguos de ancho fijo, mas su
+    descripcion ({"name", "dtype", "categories"}). Las categoricas
+    quedan como codigos y el texto como unicode, sin pickle
+    """
+    columns: list[dict] = []
+    arrays: list[np.ndarray] = []
+    for col in df.columns:
+        column: dict = {"name": col}
+        values = df[col]
+
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            column["categories"] = values.cat.categories.astype(str).tolist()
+            values = values.cat.codes
+        values = values.to_numpy()
+        if values.dtype == object:
+            values = values.astype(str)
+
+        column["dtype"] = values.dtype.str
+        columns.append(column)
+        arrays.append(np.ascontiguousarray(values))
+    return columns, arrays
+
+
+def decode(columns: list[dict], arrays: list[np.ndarray]) -> pd.DataFrame:
+    """
+    Inversa de encode, arma el DataFrame sobre los mismos arrays
+    """
+    content: dict[str, np.ndarray | pd.Categorical] = {}
+    for column, values in zip(columns, arrays):
+        if "categories" in column:
+            values = pd.Categorical.from_codes(values, column["categories"])
+        content[column["name"]] = values
+
+    # Sin copia: cada columna tiene su propio dtype (su propio
+    # bloque), pandas no necesita consolidarlas
+    return pd.DataFrame(content, copy=False)
+
+
+def _manifest(file: Path) -> Optional[dict]:
+    try:
+        return json.loads(file.read_text())
+    except FileNotFoundError:
+        return None
+
+
+def _map(file: Path, dtype: str, rows: int) -> np.ndarray:
+    # np.memmap no acepta archivos vacios
+    if not rows:
+        return np.empty(0, dtype=dtype)
+    return np.memmap(file, dtype=dtype, mode="c", shape=(rows,))
+
+
+def _prune(folder: Path, keep: set[str]) -> None:
+    # Borra las versiones que no estan en keep. En POSIX los procesos que las
+    # tienen mapeadas las siguen leyendo, en Windows quedan
+    # hasta el proximo save
+    for file in folder.glob("*.bin"):
+        if file.name not in keep:
+            try:
+                file.unlink()
+            except OSError:
+                pass
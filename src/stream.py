@@ -0,0 +1,264 @@
+import abc
+import heapq
+import math
+
+import numpy as np
+import pandas as pd
+
+from collections import deque
+from typing import Optional
+
+from src.dtypes import DateLike
+
+
+WEEKDAYS: dict[int, str] = {
+    0: "Lunes",
+    1: "Martes",
+    2: "Miercoles",
+    3: "Jueves",
+    4: "Viernes",
+    5: "Sabado",
+    6: "Domingo",
+}
+
+
+class _Stream(abc.ABC):
+    """
+    Reloj y ventana deslizante comun a los streams.
+    La ventana cubre [now - days, now], donde now es
+    la fecha de la ultima observacion ingresada, igual
+    que Window.last(days, asof=now)
+    """
+
+    def __init__(self, days: int = 365):
+        self.days: np.timedelta64 = np.timedelta64(days, "D")
+        self.now: Optional[np.datetime64] = None
+
+    @property
+    def start(self) -> np.datetime64:
+        """
+        Primer dia dentro de la ventana, las fechas
+        anteriores estan vencidas
+        """
+        return self.now - self.days
+
+    def _tick(self, date: DateLike) -> np.datetime64:
+        day = np.datetime64(pd.Timestamp(date).date(), "D")
+        if self.now is not None and day < self.now:
+            raise ValueError(f"{day} es anterior a {self.now}")
+        self.now = day
+        return day
+
+    def advance(self, date: DateLike) -> None:
+        """
+        Mueve el reloj sin ingresar datos (vence lo que quede afuera)
+        """
+        self._tick(date)
+        self._expire()
+
+    @abc.abstractmethod
+    def _expire(self) -> None:
+        """
+        Descarta lo que quedo fuera de la ventana
+        """
+
+    @classmethod
+    def from_frame(
+        cls, data: pd.DataFrame, col: str = "v", days: int = 365
+    ) -> "_Stream":
+        """
+        Crea el stream y le ingresa la historia de data
+        """
+        stream = cls(days)
+        for date, value in zip(data["date"].values, data[col].values):
+            stream.push(date, float(value))
+        return stream
+
+
+class VolatilityStream(_Stream):
+    """
+    Consigna b incremental: top de dias con mayor volatilidad
+    |log(v / v_anterior)| dentro de la ventana.
+    push es O(log n), top es O(k log n) amortizado
+
+    Example
+    -------
+    >>> stream = VolatilityStream.from_frame(data.usd)
+    >>> stream.push('2022-08-04', 296.0)
+    >>> stream.top()
+            date  volatility
+    0 2022-07-04    0.084218
+    ...
+    """
+
+    def __init__(self, days: int = 365):
+        super().__init__(days)
+        self._last: Optional[float] = None
+        self._live: deque[np.datetime64] = deque()
+        self._heap: list[tuple[float, np.datetime64]] = []
+
+    def push(self, date: DateLike, value: float) -> None:
+        day = self._tick(date)
+
+        # Sin dato valido (NaN, <= 0) no hay retorno: el siguiente
+        # se calcula contra el ultimo valor valido
+        if value > 0 and math.isfinite(value):
+            if self._last is not None:
+                vol: float = abs(math.log(value / self._last))
+                heapq.heappush(self._heap, (-vol, day))
+                self._live.append(day)
+            self._last = value
+
+        self._expire()
+
+    def _expire(self) -> None:
+        while self._live and self._live[0] < self.start:
+            self._live.popleft()
+
+        # Los vencidos quedan enterrados en el heap, se limpia
+        # cuando son mayoria para acotar la memoria
+        if len(self._heap) > 2 * len(self._live) + 64:
+            self._heap = [e for e in self._heap if e[1] >= self.start]
+            heapq.heapify(self._heap)
+
+    def top(self, n: int = 5) -> pd.DataFrame:
+        best: list[tuple[float, np.datetime64]] = []
+
+        while self._heap and len(best) < n:
+            entry = heapq.heappop(self._heap)
+            if entry[1] >= self.start:
+                best.append(entry)
+
+        for entry in best:
+            heapq.heappush(self._heap, entry)
+
+        dates = np.array([d for _, d in best], dtype="datetime64[ns]")
+        return pd.DataFrame(
+            {"date": dates, "volatility": [-v for v, _ in best]}
+        )
+
+
+class BrechaStream(_Stream):
+    """
+    Consignas a, c y d incrementales sobre la serie de brecha
+    (var_usd_vs_usd_of), todas O(1) amortizado por push
+
+    a: dia de mayor brecha, deque monotona
+    c: semana (W-FRI) con mayor rango, heap con invalidacion perezosa
+    d: promedio por dia de la semana, sumas y conteos
+
+    Example
+    -------
+    >>> stream = BrechaStream.from_frame(data.var_usd_vs_usd_of)
+    >>> stream.push('2022-08-04', 95.3)
+    >>> stream.max_day()
+    '2022-07-22'
+    >>> stream.max_week()
+    ('2022-07-18', '2022-07-22', 34.72449999999999)
+    """
+
+    def __init__(self, days: int = 365):
+        super().__init__(days)
+        self._obs: deque[tuple[np.datetime64, float]] = deque()
+        self._max: deque[tuple[np.datetime64, float]] = deque()
+        self._weeks: dict[np.datetime64, list] = {}
+        self._fridays: deque[np.datetime64] = deque()
+        self._ranges: list[tuple[float, np.datetime64]] = []
+        self._sums: np.ndarray = np.zeros(7)
+        self._counts: np.ndarray = np.zeros(7, dtype=np.int64)
+
+    def push(self, date: DateLike, value: float) -> None:
+        day = self._tick(date)
+
+        # Sin dato (NaN) solo avanza el reloj: un NaN en las sumas
+        # no se puede restar y dejaria el promedio en NaN
+        if not math.isfinite(value):
+            self._expire()
+            return
+
+        weekday: int = _weekday(day)
+
+        self._obs.append((day, value))
+        self._sums[weekday] += value
+        self._counts[weekday] += 1
+
+        # a: se descartan los que ya no pueden ser maximo,
+        # ante empate queda el mas antiguo como en la consigna
+        while self._max and self._max[-1][1] < value:
+            self._max.pop()
+        self._max.append((day, value))
+
+        # c: semanas que terminan el viernes
+        friday = day + np.timedelta64((4 - weekday) % 7, "D")
+        if friday not in self._weeks:
+            self._weeks[friday] = []
+            self._fridays.append(friday)
+        self._weeks[friday].append((day, value))
+        self._push_range(friday)
+
+        self._expire()
+
+    def _push_range(self, friday: np.datetime64) -> None:
+        heapq.heappush(self._ranges, (-self._range(friday), friday))
+
+    def _range(self, friday: np.datetime64) -> float:
+        values = [v for _, v in self._weeks[friday]]
+        return max(values) - min(values)
+
+    def _expire(self) -> None:
+        start = self.start
+
+        while self._obs and self._obs[0][0] < start:
+            day, value = self._obs.popleft()
+            self._sums[_weekday(day)] -= value
+            self._counts[_weekday(day)] -= 1
+
+        while self._max and self._max[0][0] < start:
+            self._max.popleft()
+
+        # Las semanas se recorren en orden desde la mas antigua,
+        # solo se visitan las que vencen (total o parcialmente)
+        while self._fridays:
+            friday = self._fridays[0]
+            week = self._weeks[friday]
+            if week[0][0] >= start:
+                break
+            week[:] = [obs for obs in week if obs[0] >= start]
+            if week:
+                self._push_range(friday)
+                break
+            self._fridays.popleft()
+            del self._weeks[friday]
+
+        # Cada push deja una entrada desactualizada en el heap
+        if len(self._ranges) > 4 * len(self._weeks) + 64:
+            self._ranges = [(-self._range(f), f) for f in self._weeks]
+            heapq.heapify(self._ranges)
+
+    def max_day(self) -> str:
+        return str(self._max[0][0])
+
+    def max_week(self) -> tuple[str, str, float]:
+        while self._ranges:
+            neg, friday = self._ranges[0]
+            if friday in self._weeks and -neg == self._range(friday):
+                monday = friday - np.timedelta64(4, "D")
+                return str(monday), str(friday), -neg
+            # Semana vencida o rango desactualizado
+            heapq.heappop(self._ranges)
+        raise ValueError("El stream no tiene observaciones")
+
+    def weekday_mean(self) -> pd.DataFrame:
+        seen: np.ndarray = self._counts > 0
+        means = pd.DataFrame(
+            {"v": self._sums[seen] / self._counts[seen]},
+            index=pd.Index(
+                [WEEKDAYS[i] for i in np.flatnonzero(seen)], name="date"
+            ),
+        )
+        return means.sort_values(by="v", ascending=False)
+
+
+def _weekday(day: np.datetime64) -> int:
+    # 1970-01-01 fue jueves
+    return int((day.astype(np.int64) + 3) % 7)
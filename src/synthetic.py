@@ -0,0 +1,214 @@
+import json
+import zlib
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from typing import Optional
+
+from src.dataclass import Data, to_dataframe
+from src.dtypes import JSON, DateLike, Endpoints
+from src.schema import RATE, schema_of
+
+
+ENTITIES: tuple[str, ...] = ("econ", "bcra", "misc", "fina", "trea")
+
+
+def business_days(rows: int, end: Optional[DateLike] = None) -> np.ndarray:
+    """
+    Ultimos rows dias habiles hasta end (por defecto hoy),
+    como datetime64[D] ordenado
+    """
+    last: np.datetime64 = np.datetime64(end or dt.date.today(), "D")
+    if not np.is_busday(last):
+        last = np.busday_offset(last, 0, roll="backward")
+    return np.busday_offset(last, np.arange(-rows + 1, 1), roll="backward")
+
+
+def timeline(
+    rows: int, years: float = 20, end: Optional[DateLike] = None
+) -> np.ndarray:
+    """
+    rows fechas de los ultimos years años, como datetime64[ns].
+    Si entran son dias habiles, si no se reparten uniformemente
+    dentro del dia (cotizaciones intradiarias), asi se puede escalar
+    a millones de registros sin salir del rango de datetime64[ns]
+    """
+    if rows <= years * 261:
+        return business_days(rows, end).astype("datetime64[ns]")
+
+    last: np.datetime64 = np.datetime64(end or dt.date.today(), "D")
+    first: np.datetime64 = last - int(years * 365.25)
+    span: np.ndarray = np.array([first, last + 1], dtype="datetime64[ns]")
+    ns: np.ndarray = np.linspace(*span.view(np.int64), rows, endpoint=False)
+    return ns.astype(np.int64).view("datetime64[ns]")
+
+
+def seed_of(point: str) -> int:
+    # Determinista entre procesos, hash() de str no lo es
+    return zlib.crc32(point.encode()) % 2**16
+
+
+def prices(
+    rows: int,
+    seed: int = 0,
+    base: float = 1.0,
+    drift: float = 0.0005,
+    volatility: float = 0.01,
+    end: Optional[DateLike] = None,
+    years: Optional[float] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Serie de precios con crecimiento exponencial (random walk
+    sobre el logaritmo), como el dolar. Retorna (fechas, valores).
+    Con years las fechas salen de timeline, si no son dias habiles.
+    drift y volatility son diarios, con cotizaciones intradiarias
+    se reparten entre los registros de cada dia
+    """
+    step: float = min(1.0, years * 261 / rows) if years else 1.0
+    rng = np.random.default_rng(seed)
+    steps: np.ndarray = rng.normal(
+        drift * step, volatility * np.sqrt(step), rows
+    )
+    return _dates(rows, end, years), base * np.exp(np.cumsum(steps))
+
+
+def variation(
+    rows: int,
+    seed: int = 0,
+    mean: float = 60.0,
+    std: float = 20.0,
+    end: Optional[DateLike] = None,
+    years: Optional[float] = None,
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Serie porcentual positiva, como la brecha. Retorna (fechas, valores)
+    """
+    rng = np.random.default_rng(seed)
+    values: np.ndarray = np.abs(rng.normal(mean, std, rows))
+    return _dates(rows, end, years), values
+
+
+def _dates(
+    rows: int, end: Optional[DateLike], years: Optional[float]
+) -> np.ndarray:
+    if years is None:
+        return business_days(rows, end)
+    return timeline(rows, years, end)
+
+
+def milestones(
+    count: int = 60,
+    every: int = 150,
+    end: Optional[DateLike] = None,
+) -> list[dict]:
+    """
+    Eventos politicos/economicos cada every dias, un cambio de
+    presidencia ('pres') cada 8 eventos y el resto repartido
+    entre las entidades
+    """
+    last: np.datetime64 = np.datetime64(end or dt.date.today(), "D")
+    start: np.datetime64 = last - (count - 1) * every
+    return [
+        {
+            "d": str(start + i * every),
+            "e": f"Nombre{i} Apellido",
+            "t": "pres" if i % 8 == 0 else ENTITIES[i % len(ENTITIES)],
+        }
+        for i in range(count)
+    ]
+
+
+def payload(
+    point: Endpoints,
+    rows: int = 6000,
+    seed: Optional[int] = None,
+    end: Optional[DateLike] = None,
+) -> JSON:
+    """
+    Respuesta sintetica con la forma del API para el endpoint:
+    eventos para los endpoints de registros, tasas para RATE
+    y precios para el resto
+
+    Example
+    -------
+    >>> payload("usd", rows=2)
+    [{'d': '2022-08-03', 'v': 1.0004}, {'d': '2022-08-04', 'v': 1.0011}]
+    """
+    schema = schema_of(point)
+    if schema.record:
+        return milestones(end=end)
+
+    seed = seed_of(point) if seed is None else seed
+    generate = variation if schema is RATE else prices
+    dates, values = generate(rows, seed, end=end)
+    return [
+        {"d": d, "v": round(v, 4)}
+        for d, v in zip(dates.astype(str).tolist(), values.tolist())
+    ]
+
+
+def body(
+    point: Endpoints,
+    rows: int = 6000,
+    seed: Optional[int] = None,
+    end: Optional[DateLike] = None,
+) -> bytes:
+    """
+    payload serializado como lo envia el API
+    """
+    return json.dumps(payload(point, rows, seed, end)).encode()
+
+
+def frame(
+    point: Endpoints,
+    rows: int = 5220,
+    years: float = 20,
+    seed: Optional[int] = None,
+    end: Optional[DateLike] = None,
+) -> pd.DataFrame:
+    """
+    DataFrame del endpoint armado directo desde arrays (sin pasar
+    por JSON), con los tipos de su schema. Sirve para escalar
+    a millones de registros
+
+    Example
+    -------
+    >>> frame("usd", rows=1_000_000)
+                  date          v
+    0       2006-10-18   1.000482
+    ...
+    """
+    schema = schema_of(point)
+    if schema.record:
+        every: int = max(int(years * 365.25) // 60, 1)
+        return to_dataframe(milestones(every=every, end=end), point=point)
+
+    seed = seed_of(point) if seed is None else seed
+    generate = variation if schema is RATE else prices
+    dates, values = generate(rows, seed, end=end, years=years)
+    return to_dataframe({"d": dates, "v": values}, point=point)
+
+
+def dataset(
+    rows: int = 5220,
+    years: float = 20,
+    points: tuple[Endpoints, ...] = (
+        "usd",
+        "usd_of",
+        "var_usd_vs_usd_of",
+        "milestones",
+    ),
+    end: Optional[DateLike] = None,
+) -> Data:
+    """
+    Data con los endpoints sinteticos que usan las consignas,
+    rows registros por serie dentro de los ultimos years años
+
+    Example
+    -------
+    >>> data = dataset(rows=2_000_000)
+    >>> b(data.usd, "v")
+    """
+    return Data({p: frame(p, rows, years, end=end) for p in points})
@@ -0,0 +1,308 @@
+import io
+import os
+import json
+import time
+import threading
+import tracemalloc
+
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Callable, Iterator, Optional, TextIO
+
+
+@dataclass(slots=True)
+class Span:
+    """
+    Medicion de una etapa del reporte
+
+    Attributes
+    ----------
+    stage: string
+        Etapa: fetch, decode, frame, task, regression, plot
+    name: string
+        Endpoint, tarea o figura medida
+    seconds: float
+        Duracion
+    bytes: int
+        Bytes del payload (fetch, decode)
+    rows: int
+        Registros producidos
+    peak: int
+        Pico de memoria en bytes, solo con memory=True. Los tramos
+        anidados o concurrentes comparten el pico de tracemalloc
+    """
+
+    stage: str
+    name: str
+    seconds: float = 0.0
+    bytes: int = 0
+    rows: int = 0
+    peak: int = 0
+    _start: float = field(default=0.0, repr=False)
+
+    def __enter__(self) -> "Span":
+        if _memory:
+            tracemalloc.reset_peak()
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *err: tuple) -> None:
+        self.seconds = time.perf_counter() - self._start
+        if _memory:
+            self.peak = tracemalloc.get_traced_memory()[1]
+        _publish(self)
+
+    def record(self, bytes: int = 0, rows: int = 0) -> None:
+        self.bytes += bytes
+        self.rows += rows
+
+    def exclude(self, seconds: float) -> None:
+        """
+        Descuenta de la duracion un trabajo intercalado dentro del
+        tramo que se publica en otra etapa
+        """
+        self._start += seconds
+
+    def to_dict(self) -> dict:
+        out = asdict(self)
+        del out["_start"]
+        return out
+
+
+class _Noop:
+    """
+    Tramo vacio que se usa con el tracing apagado,
+    una sola instancia compartida: no mide ni asigna nada
+    """
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_Noop":
+        return self
+
+    def __exit__(self, *err: tuple) -> None:
+        pass
+
+    def record(self, bytes: int = 0, rows: int = 0) -> None:
+        pass
+
+    def exclude(self, seconds: float) -> None:
+        pass
+
+
+Sink = Callable[[Span], None]
+
+_NOOP: _Noop = _Noop()
+_sinks: list[Sink] = []
+_memory: bool = False
+_started: bool = False
+
+
+def span(stage: str, name: str) -> Span | _Noop:
+    """
+    Tramo a medir con with, casi sin costo si el tracing esta apagado
+
+    Example
+    -------
+    >>> with trace.span("frame", "usd") as s:
+    ...     df = build()
+    ...     s.record(rows=len(df))
+    """
+    if not _sinks:
+        return _NOOP
+    return Span(stage, name)
+
+
+def emit(
+    stage: str, name: str, seconds: float, bytes: int = 0, rows: int = 0
+) -> None:
+    """
+    Publica una medicion ya tomada, por ejemplo tiempos acumulados
+    en varios pedazos o medidos en otro proceso
+    """
+    if _sinks:
+        _publish(Span(stage, name, seconds, bytes, rows))
+
+
+def enabled() -> bool:
+    return bool(_sinks)
+
+
+def enable(*sinks: Sink, memory: bool = False) -> None:
+    """
+    Activa el tracing hacia los sinks. memory=True mide ademas
+    el pico de memoria con tracemalloc (mas lento)
+    """
+    global _memory, _started
+    _sinks[:] = sinks
+    _memory = memory
+    if memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _started = True
+
+
+def disable() -> None:
+    """
+    Apaga el tracing y cierra los sinks que tengan close()
+    """
+    global _memory, _started
+    sinks, _sinks[:] = list(_sinks), []
+    if _started:
+        tracemalloc.stop()
+    _memory = _started = False
+
+    for sink in sinks:
+        close: Optional[Callable[[], None]] = getattr(sink, "close", None)
+        if close:
+            close()
+
+
+@contextmanager
+def profile(*sinks: Sink, memory: bool = False) -> Iterator[None]:
+    """
+    Tracing activo solo dentro del bloque
+
+    Example
+    -------
+    >>> collector = Collector()
+    >>> with profile(collector, memory=True):
+    ...     main()
+    >>> print(collector.table())
+    """
+    enable(*sinks, memory=memory)
+    try:
+        yield
+    finally:
+        disable()
+
+
+def _publish(span: Span) -> None:
+    for sink in _sinks:
+        sink(span)
+
+
+class Collector:
+    """
+    Sink en memoria, acumula los tramos para inspeccionarlos
+    en el mismo proceso o imprimir el desglose por etapa
+    """
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def __call__(self, span: Span) -> None:
+        self.spans.append(span)
+
+    def table(self) -> str:
+        """
+        Desglose por etapa y por nombre: llamadas, tiempo total,
+        tiempo maximo, bytes, registros y pico de memoria
+        """
+        groups: dict[tuple[str, str], list[Span]] = {}
+        for s in self.spans:
+            groups.setdefault((s.stage, s.name), []).append(s)
+            groups.setdefault((s.stage, "*"), []).append(s)
+
+        out = io.StringIO()
+        out.write("%-10s %-28s %6s %10s %10s %12s %10s %9s\n" % (
+            "stage", "name", "calls", "total ms", "max ms",
+            "bytes", "rows", "peak MiB"
+        ))
+        for (stage, name), spans in sorted(groups.items()):
+            out.write("%-10s %-28s %6i %10.1f %10.1f %12i %10i %9.2f\n" % (
+                stage, name, len(spans),
+                sum(s.seconds for s in spans) * 1000,
+                max(s.seconds for s in spans) * 1000,
+                sum(s.bytes for s in spans),
+                sum(s.rows for s in spans),
+                max(s.peak for s in spans) / 2**20,
+            ))
+        return out.getvalue()
+
+
+class JSONLog:
+    """
+    Sink que escribe un JSON por linea por cada tramo
+
+    Parameters
+    ----------
+    target: Path o archivo de texto
+        Archivo donde se agregan las lineas
+    """
+
+    def __init__(self, target: Path | str | TextIO):
+        self._own: bool = isinstance(target, (str, Path))
+        self._file: TextIO = (
+            open(target, "a", encoding="utf-8") if self._own else target
+        )
+        self._lock = threading.Lock()
+
+    def __call__(self, span: Span) -> None:
+        line: str = json.dumps({"time": time.time(), **span.to_dict()})
+        with self._lock:
+            self._file.write(line + "\n")
+
+    def close(self) -> None:
+        if self._own:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+class PrometheusFile:
+    """
+    Sink que agrega los tramos y los escribe en formato de texto
+    de Prometheus (para el textfile collector de node_exporter)
+    al cerrar o al llamar a write()
+
+    Parameters
+    ----------
+    path: Path
+        Archivo .prom, se reemplaza de forma atomica
+    prefix: string (Default "bcra")
+        Prefijo de las metricas
+    """
+
+    def __init__(self, path: Path | str, prefix: str = "bcra"):
+        self.path = Path(path)
+        self.prefix = prefix
+        self._totals: dict[tuple[str, str], list[float]] = {}
+        self._lock = threading.Lock()
+
+    def __call__(self, span: Span) -> None:
+        with self._lock:
+            total = self._totals.setdefault(
+                (span.stage, span.name), [0, 0.0, 0, 0, 0]
+            )
+            total[0] += 1
+            total[1] += span.seconds
+            total[2] += span.bytes
+            total[3] += span.rows
+            total[4] = max(total[4], span.peak)
+
+    def write(self) -> None:
+        metrics: tuple[tuple[str, str, int], ...] = (
+            ("stage_calls_total", "counter", 0),
+            ("stage_seconds_total", "counter", 1),
+            ("stage_bytes_total", "counter", 2),
+            ("stage_rows_total", "counter", 3),
+            ("stage_peak_bytes", "gauge", 4),
+        )
+        lines: list[str] = []
+        with self._lock:
+            for metric, kind, i in metrics:
+                name: str = f"{self.prefix}_{metric}"
+                lines.append(f"# TYPE {name} {kind}")
+                for (stage, point), total in sorted(self._totals.items()):
+                    lines.append(
+                        f'{name}{{stage="{stage}",name="{point}"}} {total[i]}'
+                    )
+
+        # Escritura atomica, el collector puede estar leyendo
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text("\n".join(lines) + "\n")
+        os.replace(tmp, self.path)
+
+    def close(self) -> None:
+        self.write()
@@ -0,0 +1,111 @@
+import datetime as dt
+
+import numpy as np
+import pandas as pd
+
+from dataclasses import dataclass
+from dateutil.relativedelta import relativedelta
+from typing import Optional
+
+from src.dtypes import DateLike
+from src.series import CompactSeries
+
+
+# Nanosegundos por dia
+_DAY: int = 86_400 * 10**9
+
+
+@dataclass(slots=True, frozen=True)
+class Window:
+    """
+    Ventana temporal [start, end] que se aplica con busqueda
+    binaria sobre la columna 'date' (ordenada) de un DataFrame,
+    retornando una vista en lugar de una copia filtrada
+
+    Attributes
+    ----------
+    start: datetime64 Opcional
+        Primer instante incluido, None sin limite
+    end: datetime64 Opcional
+        Ultimo instante incluido, None sin limite
+
+    Example
+    -------
+    >>> window = Window.last(days=365, asof="2022-08-04")
+    >>> window.slice(data.usd)
+                date      v
+    5318  2021-08-04  180.0
+    ...
+    >>> Window.last(years=4)          # consigna de inflacion
+    >>> Window.between("2019-12-10", "2021-12-10")
+    """
+
+    start: Optional[np.datetime64] = None
+    end: Optional[np.datetime64] = None
+
+    @classmethod
+    def last(
+        cls, days: int = 0, years: int = 0, asof: Optional[DateLike] = None
+    ) -> "Window":
+        """
+        Ultimos dias/años hasta asof (por defecto ahora).
+        Fijar asof hace reproducibles los resultados
+        """
+        end: dt.datetime = (
+            pd.Timestamp(asof).to_pydatetime() if asof else dt.datetime.today()
+        )
+        start: dt.datetime = end - relativedelta(years=years, days=days)
+        return cls(_ns(start), _ns(end))
+
+    @classmethod
+    def between(
+        cls, start: Optional[DateLike] = None, end: Optional[DateLike] = None
+    ) -> "Window":
+        return cls(
+            _ns(start) if start is not None else None,
+            _ns(end) if end is not None else None,
+        )
+
+    def bounds(self, dates: np.ndarray) -> tuple[int, int]:
+        """
+        Posiciones [i, j) de la ventana dentro de dates (ordenado)
+        """
+        i, j = 0, len(dates)
+        if self.start is not None:
+            i = int(np.searchsorted(dates, self.start))
+        if self.end is not None:
+            j = int(np.searchsorted(dates, self.end, side="right"))
+        return i, j
+
+    def days(self, days: np.ndarray) -> tuple[int, int]:
+        """
+        Posiciones [i, j) de la ventana dentro de days, dias
+        desde 1970-01-01 (ordenado), como en CompactSeries
+        """
+        i, j = 0, len(days)
+        if self.start is not None:
+            # Primer dia cuya medianoche no es anterior a start
+            first = -(-self.start.astype(np.int64) // _DAY)
+            i = int(np.searchsorted(days, first))
+        if self.end is not None:
+            last = self.end.astype(np.int64) // _DAY
+            j = int(np.searchsorted(days, last, side="right"))
+        return i, j
+
+    def slice(
+        self, data: pd.DataFrame | CompactSeries, on: str = "date"
+    ) -> pd.DataFrame | CompactSeries:
+        """
+        Filas de data dentro de la ventana, data debe estar
+        ordenado por la columna on. Con una CompactSeries
+        se busca sobre sus dias y retorna una vista
+        """
+        if isinstance(data, CompactSeries):
+            return data.slice(*self.days(data.days))
+
+        i, j = self.bounds(data[on].values)
+        return data.iloc[i:j]
+
+
+def _ns(date: DateLike) -> np.datetime64:
+    return np.datetime64(pd.Timestamp(date).to_datetime64(), "ns")
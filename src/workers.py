@@ -0,0 +1,160 @@
+import os
+
+import numpy as np
+import pandas as pd
+
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import partial
+from multiprocessing.shared_memory import SharedMemory
+from typing import Any, Callable, Iterable, Optional
+
+from src.consignas import a, b, c, d
+from src.dataclass import Data
+from src.dtypes import Endpoints
+from src.event_dolar import dolars_month_gen
+from src.regression import regression
+from src.store import decode, encode
+
+
+def _on(func: Callable[..., Any], data: Data, point: Endpoints, *args, **kw):
+    # Consignas y regresion reciben el DataFrame del endpoint
+    return func(data[point], *args, **kw)
+
+
+# trabajo: funcion(data, *args, **kwargs). Solo viaja el nombre,
+# los argumentos y el resultado, nunca la data
+JOBS: dict[str, Callable[..., Any]] = {
+    "a": partial(_on, a),
+    "b": partial(_on, b),
+    "c": partial(_on, c),
+    "d": partial(_on, d),
+    "dolars_month_gen": dolars_month_gen,
+    "regression": partial(_on, regression),
+}
+
+# Estado de cada worker, armado una vez por _attach
+_data: Optional[Data] = None
+_blocks: list[SharedMemory] = []
+
+
+class QueryPool:
+    """
+    Pool de procesos que ejecuta consignas, dolars_month_gen y
+    regresiones sobre una misma Data. Los arrays de Data se copian
+    una sola vez a memoria compartida y cada worker arma sus
+    DataFrames sobre esa memoria: los trabajos se envian por nombre
+    y no se serializa ningun DataFrame.
+
+    Los arrays compartidos son de solo lectura en los workers
+
+    Parameters
+    ----------
+    data: Data
+        Endpoints ya cargados, se publican los que tenga
+    workers: int Opcional
+        Cantidad de procesos, por defecto la cantidad de CPUs
+
+    Example
+    -------
+    >>> data = Data().call_api('usd', 'usd_of', 'var_usd_vs_usd_of')
+    >>> with QueryPool(data) as pool:
+    ...     futures = [
+    ...         pool.submit("c", "var_usd_vs_usd_of", Window.last(days=n))
+    ...         for n in (30, 90, 365)
+    ...     ]
+    ...     pool.submit("regression", "usd", (3, 6, 12)).result()
+    ...     [f.result() for f in futures]
+    """
+
+    def __init__(self, data: Data, workers: Optional[int] = None):
+        self._blocks: list[SharedMemory] = []
+        layout: dict[Endpoints, list[dict]] = {}
+
+        try:
+            for point, df in data.items():
+                layout[point] = self._publish(df)
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=workers or os.cpu_count(),
+                initializer=_attach,
+                initargs=(layout,),
+            )
+        except BaseException:
+            self._release()
+            raise
+
+    def _publish(self, df: pd.DataFrame) -> list[dict]:
+        columns, arrays = encode(df)
+        for column, values in zip(columns, arrays):
+            # SharedMemory no acepta bloques de tamaño cero
+            block = SharedMemory(create=True, size=max(values.nbytes, 1))
+            self._blocks.append(block)
+            _view(block, values.dtype, len(values))[:] = values
+            column["block"] = block.name
+            column["rows"] = len(values)
+        return columns
+
+    def submit(self, job: str, *args, **kwargs) -> Future:
+        """
+        Encola el trabajo, retorna un Future con su resultado.
+        args y kwargs se pasan despues de la data, por ejemplo
+        submit("b", "usd", "v", window) llama a b(data.usd, "v", window)
+        """
+        if job not in JOBS:
+            raise KeyError(f"Trabajo desconocido: {job!r}")
+        return self._executor.submit(_run, job, *args, **kwargs)
+
+    def map(self, job: str, params: Iterable[tuple]) -> list[Future]:
+        """
+        Un trabajo por cada tupla de argumentos de params
+        """
+        return [self.submit(job, *args) for args in params]
+
+    def shutdown(self, wait: bool = True, cancel: bool = False) -> None:
+        """
+        Espera (o cancela, con cancel=True) los trabajos pendientes,
+        termina los workers y libera la memoria compartida
+        """
+        try:
+            self._executor.shutdown(wait=wait, cancel_futures=cancel)
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        blocks, self._blocks = self._blocks, []
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    def __enter__(self) -> "QueryPool":
+        return self
+
+    def __exit__(self, kind: Optional[type], *err: tuple) -> None:
+        # Ante un error no se espera a los trabajos encolados
+        self.shutdown(cancel=kind is not None)
+
+
+def _view(block: SharedMemory, dtype: np.dtype, rows: int) -> np.ndarray:
+    return np.ndarray((rows,), dtype=dtype, buffer=block.buf)
+
+
+def _attach(layout: dict[Endpoints, list[dict]]) -> None:
+    # Initializer de cada worker: arma Data sobre la memoria compartida
+    global _data
+
+    content: dict[Endpoints, pd.DataFrame] = {}
+    for point, columns in layout.items():
+        arrays: list[np.ndarray] = []
+        for column in columns:
+            block = SharedMemory(name=column["block"])
+            _blocks.append(block)
+            values = _view(block, np.dtype(column["dtype"]), column["rows"])
+            values.flags.writeable = False
+            arrays.append(values)
+        content[point] = decode(columns, arrays)
+
+    _data = Data(content)
+
+
+def _run(job: str, *args, **kwargs) -> Any:
+    return JOBS[job](_data, *args, **kwargs)